@@ -0,0 +1,40 @@
+BEGIN TRANSACTION;
+
+-- Trigram full-text index over the searchable master_list columns, so the
+-- list search no longer runs four lower() LIKE scans over every type table.
+CREATE VIRTUAL TABLE IF NOT EXISTS master_list_fts USING fts5(
+  name,
+  model,
+  mac_address,
+  asset_tag,
+  content='master_list',
+  content_rowid='master_id',
+  tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_master_list_fts_insert
+AFTER INSERT ON master_list
+BEGIN
+  INSERT INTO master_list_fts(rowid, name, model, mac_address, asset_tag)
+  VALUES (new.master_id, new.name, new.model, new.mac_address, new.asset_tag);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_master_list_fts_delete
+AFTER DELETE ON master_list
+BEGIN
+  INSERT INTO master_list_fts(master_list_fts, rowid, name, model, mac_address, asset_tag)
+  VALUES ('delete', old.master_id, old.name, old.model, old.mac_address, old.asset_tag);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_master_list_fts_update
+AFTER UPDATE OF name, model, mac_address, asset_tag ON master_list
+BEGIN
+  INSERT INTO master_list_fts(master_list_fts, rowid, name, model, mac_address, asset_tag)
+  VALUES ('delete', old.master_id, old.name, old.model, old.mac_address, old.asset_tag);
+  INSERT INTO master_list_fts(rowid, name, model, mac_address, asset_tag)
+  VALUES (new.master_id, new.name, new.model, new.mac_address, new.asset_tag);
+END;
+
+INSERT INTO master_list_fts(master_list_fts) VALUES ('rebuild');
+
+COMMIT;
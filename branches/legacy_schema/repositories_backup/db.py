@@ -4,17 +4,25 @@
 from __future__ import annotations
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from src.utils.paths import DB_PATH, MIGRATIONS_DIR, ensure_runtime_dirs
 
+# Each type table contributes about a dozen prebuilt statements
+# (TypeTableManager._build_sql). sqlite3's default cache of 128 would evict
+# them once a handful of types is in use.
+STATEMENT_CACHE_SIZE = 256
+
 
 def _configure_connection(conn: sqlite3.Connection) -> None:
     """Apply consistent PRAGMA settings to any SQLite connection."""
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA busy_timeout = 5000;")
 
@@ -26,9 +34,14 @@ class Database:
         ensure_runtime_dirs()
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
+        self.conn = sqlite3.connect(self.path, cached_statements=STATEMENT_CACHE_SIZE)
         _configure_connection(self.conn)
         self.type_manager = TypeTableManager(self.conn)
+        self.catalog_version = 0
+
+    def bump_catalog_version(self) -> None:
+        """Invalidate lookups that repositories cache from the catalog tables."""
+        self.catalog_version += 1
 
     def close(self) -> None:
         try:
@@ -79,9 +92,9 @@ class Database:
             """
         )
 
-    def _applied_migrations(self) -> set[str]:
-        rows = self.conn.execute("SELECT filename FROM schema_migrations").fetchall()
-        return {row[0] for row in rows}
+    def _applied_migrations(self) -> frozenset[str]:
+        cur = self.conn.execute("SELECT filename FROM schema_migrations")
+        return frozenset(row[0] for row in cur)
 
     # -- context manager ------------------------------------------------
     def __enter__(self) -> "Database":
@@ -204,24 +217,95 @@ class TypeTableManager:
         "updated_at_utc",
     )
 
+    _UPSERT_SQL: str = (
+        f"INSERT INTO master_list({', '.join(MASTER_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(MASTER_COLUMNS))}) "
+        "ON CONFLICT(master_id) DO UPDATE SET "
+        + ", ".join(f"{col} = excluded.{col}" for col in MASTER_COLUMNS if col != "master_id")
+    )
+
+    _INDEX_UPSERT_SQL: str = (
+        "INSERT INTO item_index(id, type_id) VALUES (?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET type_id = excluded.type_id"
+    )
+
     def __init__(self, conn: sqlite3.Connection) -> None:
         self._conn = conn
+        self._select_sql: Dict[Tuple[str, str], str] = {}
+        self._verified: set[str] = set()
+        self._sql_cache: Dict[int, Dict[str, str]] = {}
+        self._table_names: Optional[Mapping[int, str]] = None
 
     # ---- lifecycle ---------------------------------------------------
     def sync(self) -> None:
-        for type_id in self.available_type_ids():
-            table = self.ensure_table(type_id)
-            columns = ", ".join(self.PER_TYPE_COLUMNS)
-            cur = self._conn.execute(f"SELECT {columns} FROM {table}")
-            for row in cur.fetchall():
-                if row["master_id"] is not None:
-                    self.sync_master_from_row(row)
+        """Upsert per-type rows changed since the last recorded sync."""
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                table_name TEXT PRIMARY KEY,
+                last_updated_at_utc TEXT
+            )
+            """
+        )
+        state = dict(
+            self._conn.execute("SELECT table_name, last_updated_at_utc FROM sync_state")
+        )
+        values: List[Tuple[Any, ...]] = []
+        marks: List[Tuple[str, str]] = []
+        self._table_names = None
+        for type_id, table in self.table_names.items():
+            # ">=" re-reads rows sharing the last second; the upsert is idempotent.
+            cur = self._conn.execute(self._sync_select(table), (state.get(table) or "",))
+            index_rows: List[Tuple[int, int]] = []
+            latest = state.get(table)
+            for row in cur:
+                values.append(self._master_values(row, row["master_archived"]))
+                index_rows.append((row["master_id"], type_id))
+                if latest is None or row["updated_at_utc"] > latest:
+                    latest = row["updated_at_utc"]
+            self.bulk_index(index_rows)
+            if latest is not None and latest != state.get(table):
+                marks.append((table, latest))
+        if not values and not marks:
+            return
+        with self._conn:
+            self._conn.executemany(self._UPSERT_SQL, values)
+            self._conn.executemany(
+                """
+                INSERT INTO sync_state(table_name, last_updated_at_utc) VALUES (?, ?)
+                ON CONFLICT(table_name) DO UPDATE
+                SET last_updated_at_utc = excluded.last_updated_at_utc
+                """,
+                marks,
+            )
+
+    def _sync_select(self, table: str) -> str:
+        sql = self._select_sql.get((table, "sync"))
+        if sql is None:
+            columns = ", ".join(f"t.{col}" for col in self.PER_TYPE_COLUMNS)
+            sql = (
+                f"SELECT {columns}, COALESCE(m.archived, 0) AS master_archived "
+                f"FROM {table} AS t "
+                "LEFT JOIN master_list AS m ON m.master_id = t.master_id "
+                "WHERE t.master_id IS NOT NULL AND t.updated_at_utc >= ?"
+            )
+            self._select_sql[(table, "sync")] = sql
+        return sql
 
     # ---- table discovery ---------------------------------------------
     def available_type_ids(self) -> List[int]:
         rows = self._conn.execute("SELECT id FROM hardware_types ORDER BY id").fetchall()
         return [int(row["id"]) for row in rows if int(row["id"]) in TYPE_TABLE_MAP]
 
+    @property
+    def table_names(self) -> Mapping[int, str]:
+        """Read-only ``{type_id: table}`` for present types, verified once per sync()."""
+        if self._table_names is None:
+            self._table_names = MappingProxyType(
+                {type_id: self.ensure_table(type_id) for type_id in self.available_type_ids()}
+            )
+        return self._table_names
+
     def table_name(self, type_id: int) -> str:
         try:
             return TYPE_TABLE_MAP[int(type_id)]
@@ -230,14 +314,99 @@ class TypeTableManager:
 
     def ensure_table(self, type_id: int) -> str:
         table = self.table_name(type_id)
+        if table in self._verified:
+            return table
         legacy = f"hardware_items_type_{type_id}"
         if not self._table_exists(table) and self._table_exists(legacy):
             self._conn.execute(f"ALTER TABLE {legacy} RENAME TO {table}")
         self._conn.executescript(TYPE_TABLE_BASE.format(table=table))
         self._conn.executescript(TYPE_TABLE_AUX.format(table=table))
         self._assert_master_column(table)
+        self._verified.add(table)
+        self._sql_cache[int(type_id)] = self._build_sql(table)
         return table
 
+    def sql(self, type_id: int, key: str) -> str:
+        """Return a prebuilt statement for the type's table (see _build_sql)."""
+        statements = self._sql_cache.get(int(type_id))
+        if statements is None:
+            self.ensure_table(type_id)
+            statements = self._sql_cache[int(type_id)]
+        return statements[key]
+
+    @staticmethod
+    def _build_sql(table: str) -> Dict[str, str]:
+        item_select = f"""
+            SELECT
+                hi.id,
+                hi.master_id,
+                hi.name,
+                hi.model,
+                hi.type_id,
+                hi.mac_address,
+                hi.ip_address,
+                hi.location_id,
+                hi.user_id,
+                hi.group_id,
+                hi.sub_type_id,
+                hi.notes,
+                hi.asset_tag,
+                hi.created_at_utc,
+                hi.updated_at_utc,
+                COALESCE(ml.archived, 0) AS archived
+            FROM {table} AS hi
+            LEFT JOIN master_list AS ml
+              ON hi.master_id = ml.master_id
+        """
+        # Display names joined in SQL rather than patched onto each row in Python.
+        display_select = f"""
+            SELECT
+                item.*,
+                ht.name AS type_name,
+                ht.code AS type_code,
+                lo.name AS location_name,
+                us.name AS user_name,
+                us.email AS user_email,
+                gr.name AS group_name,
+                st.name AS sub_type_name
+            FROM ({item_select} {{where}}) AS item
+            LEFT JOIN hardware_types AS ht ON ht.id = item.type_id
+            LEFT JOIN locations AS lo ON lo.id = item.location_id
+            LEFT JOIN users AS us ON us.id = item.user_id
+            LEFT JOIN groups AS gr ON gr.id = item.group_id
+            LEFT JOIN sub_types AS st ON st.id = item.sub_type_id
+        """
+        return {
+            "select_by_master": item_select + "WHERE hi.master_id = ?",
+            "select_details_by_master": display_select.format(
+                where="WHERE hi.master_id = ?"
+            ),
+            # {where} is filled with placeholder-only predicates by list_items.
+            "select_list_template": display_select,
+            "select_master_id": f"SELECT master_id FROM {table} WHERE id = ?",
+            "insert_full": f"""
+                INSERT INTO {table}(
+                    name, model, type_id, mac_address,
+                    ip_address, location_id, user_id, group_id,
+                    sub_type_id, notes, asset_tag
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            "insert_relocated": f"""
+                INSERT INTO {table}(
+                    name, model, type_id, mac_address,
+                    ip_address, location_id, user_id, group_id,
+                    sub_type_id, notes,
+                    asset_tag, created_at_utc, updated_at_utc, master_id
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            "update_master_template": f"UPDATE {table} SET {{sets}} WHERE master_id = ?",
+            "set_master_id": f"UPDATE {table} SET master_id = ? WHERE id = ?",
+            "delete_row": f"DELETE FROM {table} WHERE id = ?",
+            "delete_master": f"DELETE FROM {table} WHERE master_id = ?",
+        }
+
     def _assert_master_column(self, table: str) -> None:
         info = self._conn.execute(f"PRAGMA table_info({table})").fetchall()
         if not any(row["name"] == "master_id" for row in info):
@@ -257,20 +426,30 @@ class TypeTableManager:
         )
         return cur.fetchone() is not None
 
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Commit on exit unless a caller's transaction is already open."""
+        if self._conn.in_transaction:
+            yield
+            return
+        with self._conn:
+            yield
+
     # ---- item index helpers -----------------------------------------
     def index_item(self, *, item_id: int, type_id: int) -> None:
+        with self._transaction():
+            self._conn.execute(self._INDEX_UPSERT_SQL, (item_id, type_id))
+
+    def bulk_index(self, items: Iterable[Tuple[int, int]]) -> None:
+        """Upsert many ``(item_id, type_id)`` pairs in a single transaction."""
+        rows = list(items)
+        if not rows:
+            return
         with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO item_index(id, type_id)
-                VALUES (?, ?)
-                ON CONFLICT(id) DO UPDATE SET type_id = excluded.type_id
-                """,
-                (item_id, type_id),
-            )
+            self._conn.executemany(self._INDEX_UPSERT_SQL, rows)
 
     def delete_item_entry(self, item_id: int) -> None:
-        with self._conn:
+        with self._transaction():
             self._conn.execute("DELETE FROM item_index WHERE id = ?", (item_id,))
 
     def get_item_type(self, item_id: int) -> Optional[int]:
@@ -279,7 +458,7 @@ class TypeTableManager:
         return int(row["type_id"]) if row else None
 
     def update_item_type(self, item_id: int, new_type_id: int) -> None:
-        with self._conn:
+        with self._transaction():
             self._conn.execute(
                 "UPDATE item_index SET type_id = ? WHERE id = ?",
                 (new_type_id, item_id),
@@ -288,28 +467,12 @@ class TypeTableManager:
     # ---- data helpers ------------------------------------------------
     def fetch_item_row(self, type_id: int, per_type_id: int) -> Optional[sqlite3.Row]:
         table = self.ensure_table(type_id)
-        columns = ", ".join(self.PER_TYPE_COLUMNS)
-        cur = self._conn.execute(
-            f"""
-            SELECT {columns}
-            FROM {table}
-            WHERE id = ?
-            """,
-            (per_type_id,),
-        )
+        cur = self._conn.execute(self._select_by(table, "id"), (per_type_id,))
         return cur.fetchone()
 
     def fetch_item_row_by_master(self, type_id: int, master_id: int) -> Optional[sqlite3.Row]:
         table = self.ensure_table(type_id)
-        columns = ", ".join(self.PER_TYPE_COLUMNS)
-        cur = self._conn.execute(
-            f"""
-            SELECT {columns}
-            FROM {table}
-            WHERE master_id = ?
-            """,
-            (master_id,),
-        )
+        cur = self._conn.execute(self._select_by(table, "master_id"), (master_id,))
         return cur.fetchone()
 
     def insert_master_record(
@@ -333,7 +496,7 @@ class TypeTableManager:
         now = datetime.now(timezone.utc).isoformat()
         created = created_at_utc or now
         updated = updated_at_utc or now
-        with self._conn:
+        with self._transaction():
             cur = self._conn.execute(
                 """
                 INSERT INTO master_list(
@@ -383,9 +546,42 @@ class TypeTableManager:
             (master_id,),
         ).fetchone()
         archived = int(existing["archived"]) if existing else 0
-
+        self._conn.execute(self._UPSERT_SQL, self._master_values(row, archived))
+
+    def sync_master_from_rows(self, rows: Iterable[sqlite3.Row]) -> None:
+        """Batch variant of sync_master_from_row using one transaction."""
+        archived_map = {
+            row[0]: row[1]
+            for row in self._conn.execute("SELECT master_id, archived FROM master_list")
+        }
         values = [
-            master_id,
+            self._master_values(row, archived_map.get(row["master_id"], 0))
+            for row in rows
+            if row["master_id"] is not None
+        ]
+        if not values:
+            return
+        with self._conn:
+            self._conn.executemany(self._UPSERT_SQL, values)
+
+    def _select_from(self, table: str) -> str:
+        return self._select_by(table, "")
+
+    def _select_by(self, table: str, key: str) -> str:
+        """Return the cached per-type SELECT, optionally filtered by ``key = ?``."""
+        sql = self._select_sql.get((table, key))
+        if sql is None:
+            sql = f"SELECT {', '.join(self.PER_TYPE_COLUMNS)} FROM {table}"
+            if key:
+                sql += f" WHERE {key} = ?"
+            self._select_sql[(table, key)] = sql
+        return sql
+
+    @staticmethod
+    def _master_values(row: sqlite3.Row, archived: int) -> Tuple[Any, ...]:
+        """Order a per-type row's values to match MASTER_COLUMNS."""
+        return (
+            row["master_id"],
             row["name"],
             row["model"],
             row["type_id"],
@@ -399,26 +595,11 @@ class TypeTableManager:
             row["asset_tag"],
             row["created_at_utc"],
             row["updated_at_utc"],
-            archived,
-        ]
-        columns = ", ".join(self.MASTER_COLUMNS)
-        placeholders = ", ".join("?" for _ in self.MASTER_COLUMNS)
-        update_clause = ", ".join(
-            f"{col} = excluded.{col}"
-            for col in self.MASTER_COLUMNS
-            if col != "master_id"
-        )
-        self._conn.execute(
-            f"""
-            INSERT INTO master_list({columns})
-            VALUES ({placeholders})
-            ON CONFLICT(master_id) DO UPDATE SET {update_clause}
-            """,
-            values,
+            int(archived),
         )
 
     def delete_master_row(self, master_id: int) -> None:
-        with self._conn:
+        with self._transaction():
             self._conn.execute("DELETE FROM master_list WHERE master_id = ?", (master_id,))
 
     def fetch_master_row(self, master_id: int) -> Optional[sqlite3.Row]:
@@ -445,10 +626,6 @@ class TypeTableManager:
                 self._conn.execute(f"DROP TABLE {table}")
                 self._conn.execute(f"ALTER TABLE {temp_table} RENAME TO {table}")
             self._conn.executescript(TYPE_TABLE_AUX.format(table=table))
-            rows = self._conn.execute(
-                f"SELECT {columns} FROM {table}"
-            ).fetchall()
-            for row in rows:
-                self.sync_master_from_row(row)
+            self.sync_master_from_rows(self._conn.execute(self._select_from(table)))
         finally:
             self._conn.execute("PRAGMA defer_foreign_keys = OFF")
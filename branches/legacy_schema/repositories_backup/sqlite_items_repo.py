@@ -4,18 +4,33 @@
 from __future__ import annotations
 
 import json
+import string
 from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import sqlite3
 
+try:  # Optional: orjson encodes audit snapshots several times faster.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 from .db import Database, TypeTableManager
 
 
 _UNSET = object()
+# Drops separators and uppercases in a single translate pass.
+_MAC_TABLE = str.maketrans(string.ascii_lowercase, string.ascii_uppercase, "-:")
 from .sqlite_updates_repo import SQLiteUpdatesRepository
 
 
+def _dumps(value: Any) -> str:
+    """Compact JSON text for audit snapshots."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
 class SQLiteItemsRepository:
     """CRUD operations plus audit recording for hardware items across type tables."""
 
@@ -31,6 +46,8 @@ class SQLiteItemsRepository:
         "sub_type_id",
         "notes",
     )
+    # Shortest search the trigram index can answer; shorter terms use LIKE.
+    _FTS_MIN_QUERY = 3
 
     def __init__(
         self,
@@ -45,6 +62,8 @@ class SQLiteItemsRepository:
         self._conn = database.conn
         self._type_manager: TypeTableManager = database.type_manager
         self._updates = updates_repo or SQLiteUpdatesRepository(database)
+        self._type_codes: Dict[int, str] = {}
+        self._type_codes_version = -1
         self._ensure_master_index()
 
     def _ensure_master_index(self) -> None:
@@ -62,45 +81,43 @@ class SQLiteItemsRepository:
         self._migrate_item_keys()
 
     def _migrate_item_keys(self) -> None:
-        mappings: List[Tuple[int, int]] = []
-        updates: List[Tuple[int, int]] = []
-
-        for row in self._conn.execute("SELECT id, type_id FROM item_index"):
-            legacy_id = int(row["id"])
-            type_id = int(row["type_id"])
-            table = self._type_manager.ensure_table(type_id)
-            record = self._conn.execute(
-                f"SELECT master_id FROM {table} WHERE id = ?",
-                (legacy_id,),
-            ).fetchone()
-            if record is None:
-                continue
-            master_id = record["master_id"]
-            if master_id is None:
-                continue
-            master_id = int(master_id)
-            mappings.append((master_id, type_id))
-            updates.append((master_id, legacy_id))
-
-        if not mappings:
+        type_ids = [
+            int(row["type_id"])
+            for row in self._conn.execute("SELECT DISTINCT type_id FROM item_index")
+        ]
+        if not type_ids:
             return
+        # One join against every referenced type table instead of a lookup per row.
+        union = "\nUNION ALL\n".join(
+            f"SELECT id, {type_id} AS type_id, master_id "
+            f"FROM {self._type_manager.ensure_table(type_id)}"
+            for type_id in type_ids
+        )
+        rows = self._conn.execute(
+            f"""
+            SELECT t.master_id, ii.type_id, ii.id AS legacy_id
+            FROM item_index AS ii
+            JOIN ({union}) AS t
+              ON t.id = ii.id AND t.type_id = ii.type_id
+            WHERE t.master_id IS NOT NULL
+            """
+        ).fetchall()
+        if not rows:
+            return
+        mappings = [(int(row["master_id"]), int(row["type_id"])) for row in rows]
+        updates = [(int(row["master_id"]), int(row["legacy_id"])) for row in rows]
 
         self._conn.execute("PRAGMA defer_foreign_keys = ON")
         try:
             with self._conn:
-                for master_id, type_id in mappings:
-                    self._conn.execute(
-                        """
-                        INSERT OR IGNORE INTO item_index(id, type_id)
-                        VALUES (?, ?)
-                        """,
-                        (master_id, type_id),
-                    )
-                for master_id, legacy_id in updates:
-                    self._conn.execute(
-                        "UPDATE item_updates SET item_id = ? WHERE item_id = ?",
-                        (master_id, legacy_id),
-                    )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO item_index(id, type_id) VALUES (?, ?)",
+                    mappings,
+                )
+                self._conn.executemany(
+                    "UPDATE item_updates SET item_id = ? WHERE item_id = ?",
+                    updates,
+                )
                 self._conn.execute(
                     "DELETE FROM item_index WHERE id NOT IN (SELECT master_id FROM master_list)"
                 )
@@ -120,7 +137,7 @@ class SQLiteItemsRepository:
         limit: int = 500,
     ) -> List[Dict[str, Any]]:
         type_filter = self._normalize_ids(type_ids)
-        candidate_types = type_filter or self._type_manager.available_type_ids()
+        candidate_types = type_filter or list(self._type_manager.table_names)
         if not candidate_types:
             return []
 
@@ -131,104 +148,56 @@ class SQLiteItemsRepository:
             group_ids=group_ids,
             search=search,
         )
-        metadata = self._metadata_maps()
-
-        results: List[Dict[str, Any]] = []
-        for type_id in candidate_types:
-            table = self._type_manager.ensure_table(type_id)
-            params = list(base_params)
-            params.append(limit)
-            cur = self._conn.execute(
-                f"""
-                SELECT
-                    hi.id,
-                    hi.master_id,
-                    hi.name,
-                    hi.model,
-                    hi.type_id,
-                    hi.mac_address,
-                    hi.ip_address,
-                    hi.location_id,
-                    hi.user_id,
-                    hi.group_id,
-                    hi.sub_type_id,
-                    hi.notes,
-                    hi.asset_tag,
-                    hi.created_at_utc,
-                    hi.updated_at_utc,
-                    COALESCE(ml.archived, 0) AS archived
-                FROM {table} AS hi
-                LEFT JOIN master_list AS ml
-                  ON hi.master_id = ml.master_id
-                {where_clause}
-                LIMIT ?
-                """,
-                params,
-            )
-            for row in cur.fetchall():
-                item = dict(row)
-                master_id = item.get("master_id")
-                if master_id is None:
-                    continue
-                item["row_id"] = item.get("id")
-                item["id"] = int(master_id)
-                self._augment_item_display(item, metadata)
-                results.append(item)
 
-        if not results:
-            return []
-
-        results.sort(
-            key=lambda row: self._sort_value(row, column),
-            reverse=descending,
+        # One UNION ALL across the per-type tables; SQLite merges, sorts and limits.
+        where = f"{where_clause} AND hi.master_id IS NOT NULL" if where_clause else (
+            "WHERE hi.master_id IS NOT NULL"
+        )
+        union = "\nUNION ALL\n".join(
+            self._type_manager.sql(type_id, "select_list_template").format(where=where)
+            for type_id in candidate_types
         )
-        return results[:limit]
+        params = list(base_params) * len(candidate_types)
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT * FROM ({union}) ORDER BY {self._SQL_SORT[column]} {direction} LIMIT ?"
+        params.append(limit)
+
+        # Plain tuples zipped against one key tuple are cheaper than dict(Row);
+        # the per-type ``id`` is renamed up front so only the master id is set.
+        cur = self._conn.cursor()
+        cur.row_factory = None
+        cur.execute(sql, params)
+        keys = tuple("row_id" if d[0] == "id" else d[0] for d in cur.description)
+        results: List[Dict[str, Any]] = []
+        for row in cur:
+            item = dict(zip(keys, row))
+            item["id"] = item["master_id"]
+            results.append(item)
+        return results
 
     def get(self, item_id: int) -> Optional[Dict[str, Any]]:
         type_id = self._resolve_type_id_for_master(item_id)
         if type_id is None:
             return None
-        table = self._type_manager.ensure_table(type_id)
         row = self._conn.execute(
-            f"""
-            SELECT
-                hi.id,
-                hi.master_id,
-                hi.name,
-                hi.model,
-                hi.type_id,
-                hi.mac_address,
-                hi.ip_address,
-                hi.location_id,
-                hi.user_id,
-                hi.group_id,
-                hi.sub_type_id,
-                hi.notes,
-                hi.asset_tag,
-                hi.created_at_utc,
-                hi.updated_at_utc,
-                COALESCE(ml.archived, 0) AS archived
-            FROM {table} AS hi
-            LEFT JOIN master_list AS ml
-              ON hi.master_id = ml.master_id
-            WHERE hi.master_id = ?
-            """,
+            self._type_manager.sql(type_id, "select_by_master"),
             (item_id,),
         ).fetchone()
         if row is None:
             return None
-        item = dict(row)
-        item["row_id"] = item.get("id")
-        item["id"] = int(item["master_id"])
-        return item
+        return self._item_from_row(row)
 
     def get_details(self, item_id: int) -> Optional[Dict[str, Any]]:
-        item = self.get(item_id)
-        if not item:
+        type_id = self._resolve_type_id_for_master(item_id)
+        if type_id is None:
             return None
-        metadata = self._metadata_maps()
-        self._augment_item_display(item, metadata)
-        return item
+        row = self._conn.execute(
+            self._type_manager.sql(type_id, "select_details_by_master"),
+            (item_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return self._item_from_row(row)
 
     # ---- mutations ---------------------------------------------------
     def create(
@@ -255,18 +224,10 @@ class SQLiteItemsRepository:
         type_code = self._type_code(type_id)
         placeholder_tag = f"SDMM-{type_code}-0000"
 
-        table = self._type_manager.ensure_table(type_id)
-
+        # One transaction for the whole create; a failure rolls back every step.
         with self._conn:
             cur = self._conn.execute(
-                f"""
-                INSERT INTO {table}(
-                    name, model, type_id, mac_address,
-                    ip_address, location_id, user_id, group_id,
-                    sub_type_id, notes, asset_tag
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                self._type_manager.sql(type_id, "insert_full"),
                 (
                     name,
                     model,
@@ -283,8 +244,6 @@ class SQLiteItemsRepository:
             )
             row_id = int(cur.lastrowid)
 
-        master_id: Optional[int] = None
-        try:
             per_type_row = self._type_manager.fetch_item_row(type_id, row_id)
             if per_type_row is None:
                 raise RuntimeError("Failed to load newly created item")
@@ -304,35 +263,28 @@ class SQLiteItemsRepository:
                 created_at_utc=per_type_row["created_at_utc"],
                 updated_at_utc=per_type_row["updated_at_utc"],
             )
-
-            with self._conn:
-                self._conn.execute(
-                    f"UPDATE {table} SET master_id = ? WHERE id = ?",
-                    (master_id, row_id),
-                )
-
+            self._conn.execute(
+                self._type_manager.sql(type_id, "set_master_id"),
+                (master_id, row_id),
+            )
             self._type_manager.index_item(item_id=master_id, type_id=type_id)
 
             updated_row = self._type_manager.fetch_item_row(type_id, row_id)
-            if updated_row is not None:
-                self._type_manager.sync_master_from_row(updated_row)
-        except Exception:
-            with self._conn:
-                self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
-            if master_id is not None:
-                self._type_manager.delete_master_row(master_id)
-                self._type_manager.delete_item_entry(master_id)
-            raise
-
-        item = self.get(master_id)
-        self._record_audit(
-            type_id=type_id,
-            item_id=master_id,
-            reason="create",
-            note=note,
-            changed_fields=self._AUDIT_FIELDS,
-            snapshot_after=item,
-        )
+            if updated_row is None:
+                raise RuntimeError("Failed to load newly created item")
+            self._type_manager.sync_master_from_row(updated_row)
+
+            # The per-type row already holds every get() column; a new item is
+            # never archived, so no second lookup is needed.
+            item = self._item_from_row(updated_row, archived=0)
+            self._record_audit(
+                type_id=type_id,
+                item_id=master_id,
+                reason="create",
+                note=note,
+                changed_fields=self._AUDIT_FIELDS,
+                snapshot_after=item,
+            )
         return item or {}
 
     def update(
@@ -401,13 +353,13 @@ class SQLiteItemsRepository:
                     exclude_master=before.get("master_id"),
                 )
                 self._assert_ip_exists(merged.get("ip_address"))
-            self._relocate_item(
+            new_row = self._relocate_item(
                 master_id=item_id,
                 source_type_id=current_type_id,
                 dest_type_id=target_type_id,
                 merged_row=merged,
             )
-            after = self.get(item_id)
+            after = self._item_from_row(new_row, archived=before.get("archived", 0))
             changed_columns = [
                 column
                 for column in self._AUDIT_FIELDS
@@ -425,8 +377,6 @@ class SQLiteItemsRepository:
                 )
             return bool(changed_columns)
 
-        table = self._type_manager.ensure_table(current_type_id)
-
         sets: List[str] = []
         params: List[Any] = []
         for column, value in fields.items():
@@ -445,14 +395,23 @@ class SQLiteItemsRepository:
             params.append(item_id)
             with self._conn:
                 cur = self._conn.execute(
-                    f"UPDATE {table} SET {', '.join(sets)} WHERE master_id = ?",
+                    self._type_manager.sql(current_type_id, "update_master_template").format(
+                        sets=", ".join(sets)
+                    ),
                     params,
                 )
                 if cur.rowcount == 0:
                     return False
-                self._sync_master_row(current_type_id, item_id)
-
-        after = self.get(item_id)
+                # Re-read once: the touch trigger rewrites updated_at_utc after
+                # the UPDATE, so RETURNING would report the stale value. The
+                # same row feeds the master_list sync and the after snapshot.
+                after_row = self._conn.execute(
+                    self._type_manager.sql(current_type_id, "select_by_master"),
+                    (item_id,),
+                ).fetchone()
+                self._type_manager.sync_master_from_row(after_row)
+
+        after = self._item_from_row(after_row) if sets else before
         if sets:
             changed_columns = [
                 column
@@ -482,7 +441,6 @@ class SQLiteItemsRepository:
         if not before:
             return False
 
-        table = self._type_manager.ensure_table(type_id)
         master_id = before.get("master_id")
         if master_id is None:
             raise ValueError("Item missing master reference")
@@ -541,20 +499,20 @@ class SQLiteItemsRepository:
                 "UPDATE master_list SET archived = 1, ip_address = NULL, updated_at_utc = ? WHERE master_id = ?",
                 (now, master_id),
             )
-            self._conn.execute(f"DELETE FROM {table} WHERE master_id = ?", (master_id,))
+            self._conn.execute(
+                self._type_manager.sql(type_id, "delete_master"), (master_id,)
+            )
             self._conn.execute("DELETE FROM item_updates WHERE item_id = ?", (item_id,))
-
-        self._record_audit(
-            type_id=type_id,
-            item_id=item_id,
-            reason="delete",
-            note=note,
-            changed_fields=["archived"],
-            snapshot_before=before,
-            snapshot_after=None,
-        )
-
-        self._type_manager.delete_item_entry(item_id)
+            self._record_audit(
+                type_id=type_id,
+                item_id=item_id,
+                reason="delete",
+                note=note,
+                changed_fields=["archived"],
+                snapshot_before=before,
+                snapshot_after=None,
+            )
+            self._type_manager.delete_item_entry(item_id)
         return True
 
     # ---- helpers -----------------------------------------------------
@@ -630,81 +588,29 @@ class SQLiteItemsRepository:
                 "UPDATE master_list SET archived = 1, updated_at_utc = ? WHERE master_id = ?",
                 (now, master_id),
             )
-        after = self.get(item_id)
-        self._record_audit(
-            type_id=item["type_id"],
-            item_id=item_id,
-            reason="archive",
-            note=note,
-            changed_fields=["archived"],
-            snapshot_before=before,
-            snapshot_after=after,
-        )
+            # get() reads per-type columns plus master_list.archived, so only that flips.
+            after = {**before, "archived": 1}
+            self._record_audit(
+                type_id=item["type_id"],
+                item_id=item_id,
+                reason="archive",
+                note=note,
+                changed_fields=["archived"],
+                snapshot_before=before,
+                snapshot_after=after,
+            )
         return True
 
     # ---- internal helpers -------------------------------------------
-    def _metadata_maps(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
-        types = {
-            int(row["id"]): {"name": row["name"], "code": row["code"]}
-            for row in self._conn.execute("SELECT id, name, code FROM hardware_types")
-        }
-        locations = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM locations")
-        }
-        users = {
-            int(row["id"]): {"name": row["name"], "email": row["email"]}
-            for row in self._conn.execute("SELECT id, name, email FROM users")
-        }
-        groups = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM groups")
-        }
-        sub_types = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM sub_types")
-        }
-        return {
-            "types": types,
-            "locations": locations,
-            "users": users,
-            "groups": groups,
-            "sub_types": sub_types,
-        }
-
-    def _augment_item_display(
-        self,
-        item: Dict[str, Any],
-        metadata: Dict[str, Dict[int, Dict[str, Any]]],
-    ) -> None:
-        type_meta = metadata["types"].get(int(item["type_id"]))
-        if type_meta:
-            item["type_name"] = type_meta["name"]
-            item["type_code"] = type_meta["code"]
-        else:
-            item["type_name"] = None
-            item["type_code"] = None
-
-        location_id = item.get("location_id")
-        loc_meta = metadata["locations"].get(int(location_id)) if location_id is not None else None
-        item["location_name"] = loc_meta["name"] if loc_meta else None
-
-        user_id = item.get("user_id")
-        user_meta = metadata["users"].get(int(user_id)) if user_id is not None else None
-        if user_meta:
-            item["user_name"] = user_meta["name"]
-            item["user_email"] = user_meta["email"]
-        else:
-            item["user_name"] = None
-            item["user_email"] = None
-
-        group_id = item.get("group_id")
-        group_meta = metadata["groups"].get(int(group_id)) if group_id is not None else None
-        item["group_name"] = group_meta["name"] if group_meta else None
-
-        sub_type_id = item.get("sub_type_id")
-        sub_meta = metadata["sub_types"].get(int(sub_type_id)) if sub_type_id is not None else None
-        item["sub_type_name"] = sub_meta["name"] if sub_meta else None
+    @staticmethod
+    def _item_from_row(row: sqlite3.Row, *, archived: Optional[int] = None) -> Dict[str, Any]:
+        """Shape a per-type row like get(): master id as ``id``, own id as ``row_id``."""
+        item = dict(row)
+        if archived is not None:
+            item["archived"] = archived
+        item["row_id"] = item.get("id")
+        item["id"] = int(item["master_id"])
+        return item
 
     def _parse_order(self, order_by: str) -> Tuple[str, bool]:
         clause = (order_by or "").strip() or "updated_at_utc DESC"
@@ -712,17 +618,44 @@ class SQLiteItemsRepository:
         column = parts[0]
         if "." in column:
             column = column.split(".")[-1]
+        if column not in self._SQL_SORT:
+            raise ValueError(f"Unsupported order column: {column}")
         direction = parts[1].upper() if len(parts) > 1 else "ASC"
         descending = direction == "DESC"
         return column, descending
 
-    def _sort_value(self, row: Dict[str, Any], column: str) -> Any:
-        value = row.get(column)
-        if value is None:
-            return ""
-        if isinstance(value, str):
-            return value.lower()
-        return value
+    # Orderable columns and their SQL sort keys over the per-type list rows.
+    _SQL_SORT: Dict[str, str] = {
+        "id": "master_id",
+        "master_id": "master_id",
+        "row_id": "id",
+        "type_id": "type_id",
+        "location_id": "location_id",
+        "user_id": "user_id",
+        "group_id": "group_id",
+        "sub_type_id": "sub_type_id",
+        "archived": "archived",
+        **{
+            col: f"lower(COALESCE({col}, ''))"
+            for col in (
+                "name",
+                "model",
+                "mac_address",
+                "ip_address",
+                "notes",
+                "asset_tag",
+                "created_at_utc",
+                "updated_at_utc",
+                "type_name",
+                "type_code",
+                "location_name",
+                "user_name",
+                "user_email",
+                "group_name",
+                "sub_type_name",
+            )
+        },
+    }
 
     def _resolve_type_id_for_master(self, master_id: int) -> Optional[int]:
         row = self._conn.execute(
@@ -757,15 +690,23 @@ class SQLiteItemsRepository:
         def _apply_in(column: str, values: List[int]) -> None:
             if not values:
                 return
-            placeholders = ", ".join("?" for _ in values)
-            where.append(f"{column} IN ({placeholders})")
-            params.extend(values)
+            # One JSON parameter keeps the SQL text (and cached statement)
+            # stable however many ids are selected.
+            where.append(f"{column} IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(values))
 
         _apply_in("hi.location_id", self._normalize_ids(location_ids))
         _apply_in("hi.user_id", self._normalize_ids(user_ids))
         _apply_in("hi.group_id", self._normalize_ids(group_ids))
 
-        if search:
+        if search and len(search) >= self._FTS_MIN_QUERY:
+            # Trigram index needs three characters; quoted so punctuation in
+            # tags/MACs is matched literally.
+            where.append(
+                "hi.master_id IN (SELECT rowid FROM master_list_fts WHERE master_list_fts MATCH ?)"
+            )
+            params.append('"' + search.replace('"', '""') + '"')
+        elif search:
             like = f"%{search.lower()}%"
             where.append(
                 """
@@ -804,20 +745,24 @@ class SQLiteItemsRepository:
             )
 
     def _type_code(self, type_id: int) -> str:
-        cur = self._conn.execute(
-            "SELECT code FROM hardware_types WHERE id = ?",
-            (type_id,),
-        )
-        row = cur.fetchone()
-        if not row:
+        # Codes are cached until the types repository bumps catalog_version.
+        version = getattr(self._db, "catalog_version", 0)
+        if self._type_codes_version != version:
+            self._type_codes = {
+                int(row["id"]): row["code"]
+                for row in self._conn.execute("SELECT id, code FROM hardware_types")
+            }
+            self._type_codes_version = version
+        code = self._type_codes.get(int(type_id))
+        if code is None:
             raise ValueError(f"hardware_type id {type_id} not found")
-        return row["code"]
+        return code
 
     @staticmethod
     def _normalize_mac(mac: Optional[str]) -> Optional[str]:
         if mac is None:
             return None
-        return mac.replace("-", "").replace(":", "").upper()
+        return mac.translate(_MAC_TABLE)
 
     @staticmethod
     def _normalize_ip(ip: object) -> Optional[str]:
@@ -843,22 +788,12 @@ class SQLiteItemsRepository:
         source_type_id: int,
         dest_type_id: int,
         merged_row: Dict[str, Any],
-    ) -> None:
-        source_table = self._type_manager.ensure_table(source_type_id)
-        dest_table = self._type_manager.ensure_table(dest_type_id)
+    ) -> sqlite3.Row:
         placeholder_tag = f"SDMM-{self._type_code(dest_type_id)}-0000"
 
         with self._conn:
             self._conn.execute(
-                f"""
-                INSERT INTO {dest_table}(
-                    name, model, type_id, mac_address,
-                    ip_address, location_id, user_id, group_id,
-                    sub_type_id, notes,
-                    asset_tag, created_at_utc, updated_at_utc, master_id
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                self._type_manager.sql(dest_type_id, "insert_relocated"),
                 (
                     merged_row.get("name"),
                     merged_row.get("model"),
@@ -877,18 +812,18 @@ class SQLiteItemsRepository:
                 ),
             )
             self._conn.execute(
-                f"DELETE FROM {source_table} WHERE master_id = ?",
+                self._type_manager.sql(source_type_id, "delete_master"),
                 (master_id,),
             )
-
-        self._conn.execute(
-            "UPDATE master_list SET type_id = ? WHERE master_id = ?",
-            (dest_type_id, master_id),
-        )
-        new_row = self._type_manager.fetch_item_row_by_master(dest_type_id, master_id)
-        if new_row:
+            # The upsert from the relocated row carries the new type_id, so
+            # master_list needs no separate UPDATE. RETURNING can't replace
+            # this read: the asset_tag is rewritten by an AFTER INSERT trigger.
+            new_row = self._type_manager.fetch_item_row_by_master(dest_type_id, master_id)
+            if new_row is None:
+                raise RuntimeError("Failed to load relocated item")
             self._type_manager.sync_master_from_row(new_row)
-        self._type_manager.update_item_type(master_id, dest_type_id)
+            self._type_manager.update_item_type(master_id, dest_type_id)
+        return new_row
 
     def _record_audit(
         self,
@@ -901,8 +836,18 @@ class SQLiteItemsRepository:
         snapshot_before: Optional[Dict[str, Any]] = None,
         snapshot_after: Optional[Dict[str, Any]] = None,
     ) -> None:
-        before_json = json.dumps(snapshot_before) if snapshot_before else None
-        after_json = json.dumps(snapshot_after) if snapshot_after else None
+        if snapshot_before and snapshot_after:
+            # Edits keep only the columns that moved; create/delete carry one
+            # full snapshot since every field is meaningful there.
+            diff = [
+                key
+                for key, value in snapshot_after.items()
+                if snapshot_before.get(key) != value
+            ]
+            snapshot_before = {key: snapshot_before.get(key) for key in diff}
+            snapshot_after = {key: snapshot_after[key] for key in diff}
+        before_json = _dumps(snapshot_before) if snapshot_before else None
+        after_json = _dumps(snapshot_after) if snapshot_after else None
         self._updates.record(
             item_id=item_id,
             reason=reason,
@@ -911,8 +856,3 @@ class SQLiteItemsRepository:
             snapshot_before_json=before_json,
             snapshot_after_json=after_json,
         )
-
-    def _sync_master_row(self, type_id: int, master_id: int) -> None:
-        row = self._type_manager.fetch_item_row_by_master(type_id, master_id)
-        if row:
-            self._type_manager.sync_master_from_row(row)
@@ -20,6 +20,11 @@ class SQLiteTypesRepository:
             return self._db.conn
         raise RuntimeError("SQLiteTypesRepository expects Database or Connection.")
 
+    def _touch_catalog(self) -> None:
+        # Lets the items repository drop its cached type codes after a change.
+        if hasattr(self._db, "bump_catalog_version"):
+            self._db.bump_catalog_version()
+
     # ---- queries -----------------------------------------------------
     def list_types(self, *, order_by: str = "name") -> List[Dict[str, str]]:
         conn = self._conn()
@@ -60,7 +65,8 @@ class SQLiteTypesRepository:
             cur = conn.execute(
                 "INSERT INTO hardware_types(name, code) VALUES (?, ?)", (name, code)
             )
-            return cur.lastrowid
+        self._touch_catalog()
+        return cur.lastrowid
 
     def update(self, type_id: int, *, name: Optional[str] = None, code: Optional[str] = None) -> bool:
         if name is None and code is None:
@@ -79,10 +85,12 @@ class SQLiteTypesRepository:
             cur = conn.execute(
                 f"UPDATE hardware_types SET {', '.join(sets)} WHERE id = ?", params
             )
-            return cur.rowcount > 0
+        self._touch_catalog()
+        return cur.rowcount > 0
 
     def delete(self, type_id: int) -> bool:
         conn = self._conn()
         with conn:
             cur = conn.execute("DELETE FROM hardware_types WHERE id = ?", (type_id,))
-            return cur.rowcount > 0
+        self._touch_catalog()
+        return cur.rowcount > 0
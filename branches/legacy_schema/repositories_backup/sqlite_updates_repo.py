@@ -31,32 +31,41 @@ class SQLiteUpdatesRepository:
         snapshot_before_json: Optional[str] = None,
         snapshot_after_json: Optional[str] = None,
     ) -> int:
+        params = (
+            item_id,
+            reason,
+            note,
+            ",".join(changed_fields) if changed_fields else None,
+            snapshot_before_json,
+            snapshot_after_json,
+            datetime.now(timezone.utc).isoformat(),
+        )
         conn = self._conn()
+        # Join a caller's open transaction so an item mutation and its audit
+        # row commit together; only commit here when called standalone.
+        if conn.in_transaction:
+            return self._insert(conn, params)
         with conn:
-            cur = conn.execute(
-                """
-                INSERT INTO item_updates(
-                    item_id,
-                    reason,
-                    note,
-                    changed_fields,
-                    snapshot_before_json,
-                    snapshot_after_json,
-                    created_at_utc
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    item_id,
-                    reason,
-                    note,
-                    ",".join(changed_fields) if changed_fields else None,
-                    snapshot_before_json,
-                    snapshot_after_json,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
+            return self._insert(conn, params)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, params: tuple) -> int:
+        cur = conn.execute(
+            """
+            INSERT INTO item_updates(
+                item_id,
+                reason,
+                note,
+                changed_fields,
+                snapshot_before_json,
+                snapshot_after_json,
+                created_at_utc
             )
-            return cur.lastrowid
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            params,
+        )
+        return cur.lastrowid
 
     def list_for_item(self, item_id: int, *, limit: int = 50) -> List[Dict[str, str]]:
         cur = self._conn().execute(
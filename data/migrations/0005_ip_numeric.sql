@@ -0,0 +1,19 @@
+BEGIN TRANSACTION;
+
+-- Packed IPv4 value so available addresses can be ordered numerically in SQL.
+-- Anything that is not a dotted quad (e.g. the 'None' placeholder) stays NULL.
+ALTER TABLE ip_addresses ADD COLUMN ip_numeric INTEGER GENERATED ALWAYS AS (
+  CASE
+    WHEN ip_address GLOB '[0-9]*.[0-9]*.[0-9]*.[0-9]*'
+     AND ip_address NOT GLOB '*[^0-9.]*'
+     AND length(ip_address) - length(replace(ip_address, '.', '')) = 3
+    THEN (CAST(substr(ip_address, 1, instr(ip_address, '.') - 1) AS INTEGER) << 24)
+        | (CAST(substr(substr(ip_address, instr(ip_address, '.') + 1), 1, instr(substr(ip_address, instr(ip_address, '.') + 1), '.') - 1) AS INTEGER) << 16)
+        | (CAST(substr(substr(substr(ip_address, instr(ip_address, '.') + 1), instr(substr(ip_address, instr(ip_address, '.') + 1), '.') + 1), 1, instr(substr(substr(ip_address, instr(ip_address, '.') + 1), instr(substr(ip_address, instr(ip_address, '.') + 1), '.') + 1), '.') - 1) AS INTEGER) << 8)
+        | CAST(substr(substr(substr(ip_address, instr(ip_address, '.') + 1), instr(substr(ip_address, instr(ip_address, '.') + 1), '.') + 1), instr(substr(substr(ip_address, instr(ip_address, '.') + 1), instr(substr(ip_address, instr(ip_address, '.') + 1), '.') + 1), '.') + 1) AS INTEGER)
+  END
+) VIRTUAL;
+
+CREATE INDEX idx_ip_addresses_numeric ON ip_addresses(ip_numeric, ip_address);
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN TRANSACTION;
+
+-- Covers the NOT EXISTS probe in list_available (ip_address + archived)
+-- so availability checks never touch the items table itself.
+CREATE INDEX IF NOT EXISTS ix_items_ip_archived
+  ON items(ip_address, archived)
+  WHERE ip_address IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,6 @@
+BEGIN TRANSACTION;
+
+-- updated_at_utc is now written explicitly by every UPDATE on items.
+DROP TRIGGER IF EXISTS trg_items_touch_updated;
+
+COMMIT;
@@ -0,0 +1,8 @@
+BEGIN TRANSACTION;
+
+-- Asset tags are computed by the application and written with the row.
+-- These triggers re-derived them from archive.id, clobbering the real tag.
+DROP TRIGGER IF EXISTS trg_archive_asset_tag_after_insert;
+DROP TRIGGER IF EXISTS trg_archive_asset_tag_after_type_change;
+
+COMMIT;
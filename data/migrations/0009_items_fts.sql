@@ -0,0 +1,41 @@
+BEGIN TRANSACTION;
+
+-- Trigram full-text index over the searchable item columns. Keeps the
+-- substring semantics of the old LIKE '%x%' search while letting SQLite
+-- answer it from the index instead of scanning and lower()-ing every row.
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+  name,
+  model,
+  mac_address,
+  asset_tag,
+  content='items',
+  content_rowid='id',
+  tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_insert
+AFTER INSERT ON items
+BEGIN
+  INSERT INTO items_fts(rowid, name, model, mac_address, asset_tag)
+  VALUES (new.id, new.name, new.model, new.mac_address, new.asset_tag);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_delete
+AFTER DELETE ON items
+BEGIN
+  INSERT INTO items_fts(items_fts, rowid, name, model, mac_address, asset_tag)
+  VALUES ('delete', old.id, old.name, old.model, old.mac_address, old.asset_tag);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_update
+AFTER UPDATE OF name, model, mac_address, asset_tag ON items
+BEGIN
+  INSERT INTO items_fts(items_fts, rowid, name, model, mac_address, asset_tag)
+  VALUES ('delete', old.id, old.name, old.model, old.mac_address, old.asset_tag);
+  INSERT INTO items_fts(rowid, name, model, mac_address, asset_tag)
+  VALUES (new.id, new.name, new.model, new.mac_address, new.asset_tag);
+END;
+
+INSERT INTO items_fts(items_fts) VALUES ('rebuild');
+
+COMMIT;
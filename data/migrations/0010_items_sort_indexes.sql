@@ -0,0 +1,12 @@
+BEGIN TRANSACTION;
+
+-- Case-insensitive sort keys for the item list. Leading with archived lets
+-- "WHERE archived = 0 ORDER BY lower(name) LIMIT ?" walk the index in order
+-- instead of sorting every active row.
+CREATE INDEX IF NOT EXISTS ix_items_active_name_lower
+  ON items(archived, lower(name));
+
+CREATE INDEX IF NOT EXISTS ix_items_active_model_lower
+  ON items(archived, lower(model));
+
+COMMIT;
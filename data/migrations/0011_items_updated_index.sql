@@ -0,0 +1,10 @@
+BEGIN TRANSACTION;
+
+-- The item list defaults to "WHERE archived = 0 ORDER BY updated_at_utc DESC
+-- LIMIT ?"; this lets it read the newest active rows straight off the index.
+-- Catalog joins were replaced by in-memory metadata maps, and the foreign
+-- key columns are already indexed, so no further indexes are needed here.
+CREATE INDEX IF NOT EXISTS ix_items_active_updated
+  ON items(archived, updated_at_utc);
+
+COMMIT;
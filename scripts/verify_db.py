@@ -1,9 +1,11 @@
 # Rev 1.2.0 - Distro
 
 """Quick integrity check for the AssetForge SQLite database."""
+import argparse
 import sqlite3
 from pathlib import Path
 import sys
+from typing import Literal
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -11,21 +13,40 @@ if str(ROOT) not in sys.path:
 
 from src.utils.paths import DB_PATH, ensure_runtime_dirs
 
+# smoke reads two header counters (O(1)); quick and deep scan every page.
+_CHECKS = {
+    "quick": "PRAGMA quick_check",
+    "deep": "PRAGMA integrity_check",
+}
 
-def verify(db_path: Path) -> bool:
+
+def verify(db_path: Path, mode: Literal["quick", "deep", "smoke"] = "smoke") -> bool:
     conn = sqlite3.connect(db_path)
     try:
-        conn.execute("PRAGMA quick_check")
+        if mode == "smoke":
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            return int(page_count) >= 0 and int(freelist_count) >= 0
+        if mode not in _CHECKS:
+            raise ValueError(f"Unsupported verify mode: {mode}")
+        rows = conn.execute(_CHECKS[mode]).fetchall()
+        return [tuple(row) for row in rows] == [("ok",)]
+    except sqlite3.DatabaseError:
+        return False
     finally:
         conn.close()
-    return True
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=("smoke", "quick", "deep"), default="smoke")
+    args = parser.parse_args()
+
     ensure_runtime_dirs()
     db_file = DB_PATH
     if not db_file.exists():
         print(f"Database not found at {db_file}")
     else:
-        verify(db_file)
-        print("Database quick check completed")
+        ok = verify(db_file, args.mode)
+        print(f"Database {args.mode} check {'passed' if ok else 'FAILED'}")
+        raise SystemExit(0 if ok else 1)
@@ -2,8 +2,10 @@
 
 """Logging setup helpers for AssetForge."""
 from __future__ import annotations
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Tuple
 
@@ -35,9 +37,14 @@ def setup_logging(name: str = "assetforge") -> logging.Logger:
     logger.setLevel(logging.INFO)
 
     if not logger.handlers:
+        # Callers only enqueue records; the listener thread does the disk and
+        # console writes so the UI thread never blocks on logging I/O.
         file_handler, console = _make_handlers(logfile)
-        logger.addHandler(file_handler)
-        logger.addHandler(console)
+        records: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+        listener = QueueListener(records, file_handler, console, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(records))
 
     logger.debug("Logging ready at %s", logfile)
     return logger
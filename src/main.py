@@ -4,9 +4,10 @@
 from __future__ import annotations
 
 import sys
+from typing import Dict, List
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtCore import QCoreApplication, QEventLoop, QMetaObject, QThreadPool, Qt
 
 from src.logging_setup import setup_logging
 from src.repositories.db import Database
@@ -14,26 +15,55 @@ from src.utils.paths import DB_PATH, ensure_runtime_dirs
 from src.ui.main_window import MainWindow
 
 
+def _migrate_in_background(db: Database) -> List[str]:
+    """Run migrations on the thread pool while the event loop keeps painting."""
+    loop = QEventLoop()
+    outcome: Dict[str, object] = {}
+
+    def task() -> None:
+        try:
+            outcome["applied"] = db.run_migrations()
+        except BaseException as exc:  # re-raised on the GUI thread below
+            outcome["error"] = exc
+        finally:
+            QMetaObject.invokeMethod(loop, "quit", Qt.QueuedConnection)
+
+    QThreadPool.globalInstance().start(task)
+    loop.exec()
+    if "error" in outcome:
+        raise outcome["error"]  # type: ignore[misc]
+    return outcome["applied"]  # type: ignore[return-value]
+
+
 def main() -> int:
     """Boot the Qt application, ensuring migrations and logging are ready."""
     ensure_runtime_dirs()
     logger = setup_logging()
     logger.info("AssetForge starting up")
 
+    # Qt6 enables high-DPI scaling by default; the app is created before the
+    # migrations so the splash paints while they run.
+    app = QApplication(sys.argv)
+    QCoreApplication.setOrganizationName("assetforge")
+    QCoreApplication.setApplicationName("AssetForge")
+
+    splash = QSplashScreen()
+    splash.showMessage("Preparing database…", Qt.AlignBottom | Qt.AlignHCenter)
+    splash.show()
+    app.processEvents()
+
     with Database(DB_PATH) as db:
-        applied = db.run_migrations()
+        applied = _migrate_in_background(db)
         if applied:
             logger.info("Applied migrations: %s", ", ".join(applied))
         else:
             logger.info("Database already up-to-date")
 
-        app = QApplication(sys.argv)
-        QCoreApplication.setOrganizationName("assetforge")
-        QCoreApplication.setApplicationName("AssetForge")
-
         window = MainWindow(database=db)
         window.show()
+        splash.finish(window)
         exit_code = app.exec()
+        db.shutdown()
 
     logger.info("AssetForge shutting down with code %s", exit_code)
     return exit_code
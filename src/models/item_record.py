@@ -3,11 +3,11 @@
 """Typed representation of inventory items used by the UI layer."""
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, Mapping, Optional
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ItemRecord:
     id: int
     type_serial: int
@@ -74,7 +74,77 @@ class ItemRecord:
             archived=bool(row["archived"]),
         )
 
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping[str, Any]],
+        metadata: Mapping[str, Dict[int, Dict[str, Any]]],
+    ) -> List["ItemRecord"]:
+        """Batch ``from_row``: metadata maps are bound once for the whole loop.
+
+        sqlite3 already returns INTEGER columns as ints, and a ``None`` id
+        simply misses in the maps, so no per-row coercion is needed.
+        """
+        types = metadata["types"]
+        locations = metadata["locations"]
+        users = metadata["users"]
+        groups = metadata["groups"]
+        sub_types = metadata["sub_types"]
+        records = []
+        append = records.append
+        for row in rows:
+            type_id = row["type_id"]
+            type_meta = types.get(type_id)
+            location_id = row["location_id"]
+            loc_meta = locations.get(location_id)
+            user_id = row["user_id"]
+            user_meta = users.get(user_id)
+            group_id = row["group_id"]
+            group_meta = groups.get(group_id)
+            sub_type_id = row["sub_type_id"]
+            sub_meta = sub_types.get(sub_type_id)
+            append(
+                cls(
+                    row["id"],
+                    row["type_serial"],
+                    row["name"],
+                    row["model"],
+                    type_id,
+                    type_meta["name"] if type_meta else None,
+                    type_meta["code"] if type_meta else None,
+                    row["mac_address"],
+                    row["ip_address"],
+                    location_id,
+                    loc_meta["name"] if loc_meta else None,
+                    user_id,
+                    user_meta["name"] if user_meta else None,
+                    user_meta["email"] if user_meta else None,
+                    group_id,
+                    group_meta["name"] if group_meta else None,
+                    sub_type_id,
+                    sub_meta["name"] if sub_meta else None,
+                    row["notes"],
+                    row["extension"],
+                    row["asset_tag"],
+                    row["created_at_utc"],
+                    row["updated_at_utc"],
+                    bool(row["archived"]),
+                )
+            )
+        return records
+
+    def changed_fields(self, other: "ItemRecord") -> List[str]:
+        """Names of the fields whose values differ between two records."""
+        return [
+            name for name in _FIELD_NAMES if getattr(self, name) != getattr(other, name)
+        ]
+
     def as_dict(self) -> Dict[str, Any]:
-        payload = asdict(self)
+        # Every field is a scalar, so a shallow copy matches asdict() without
+        # its recursive deepcopy.
+        payload = {name: getattr(self, name) for name in _FIELD_NAMES}
         payload["archived"] = int(self.archived)
         return payload
+
+
+_FIELD_NAMES = tuple(field.name for field in fields(ItemRecord))
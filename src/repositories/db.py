@@ -3,33 +3,168 @@
 """SQLite helper utilities for AssetForge."""
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import ClassVar, Iterator, List, Optional
 
 from src.utils.paths import DB_PATH, MIGRATIONS_DIR, ensure_runtime_dirs
 
 
-def _configure_connection(conn: sqlite3.Connection) -> None:
-    """Apply consistent PRAGMA settings to any SQLite connection."""
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Per-connection prepared statement cache (sqlite3 defaults to 128).
+STATEMENT_CACHE_SIZE = 256
+
+
+class _SharedConnection:
+    """Writer connection plus state shared by every Database on one file."""
+
+    __slots__ = ("conn", "synchronous", "catalog_version", "write_lock", "write_depth")
+
+    def __init__(self, conn: sqlite3.Connection, synchronous: str) -> None:
+        self.conn = conn
+        self.synchronous = synchronous
+        self.catalog_version = 0
+        self.write_lock = threading.RLock()
+        self.write_depth = 0
+
+
+_CONN_CACHE: dict[Path, _SharedConnection] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+
+def _synchronous_mode(value: str) -> str:
+    mode = value.upper()
+    if mode not in _SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported synchronous mode: {value}")
+    return mode
+
+
+def _configure_connection(conn: sqlite3.Connection, *, synchronous: str = "NORMAL") -> None:
+    """Apply consistent PRAGMA settings to any SQLite connection.
+
+    ``synchronous=NORMAL`` is safe under WAL and skips the fsync on every
+    commit; bulk loaders may pass ``"OFF"`` while they own the database.
+    """
+    mode = _synchronous_mode(synchronous)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode = WAL;")
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA busy_timeout = 5000;")
+    conn.execute(f"PRAGMA synchronous = {mode};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -64000;")
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    conn.execute("PRAGMA wal_autocheckpoint = 1000;")
 
 
 class Database:
     """Thin SQLite wrapper that handles migrations and connection lifecycle."""
 
-    def __init__(self, path: Path | str = DB_PATH) -> None:
-        ensure_runtime_dirs()
+    READ_POOL_SIZE: ClassVar[int] = 4
+
+    _default: ClassVar[Optional["Database"]] = None
+    _default_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path | str = DB_PATH, *, synchronous: Optional[str] = None) -> None:
         self.path = Path(path)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
-        _configure_connection(self.conn)
+        self._shared = self._shared_connection(synchronous)
+        self.conn = self._shared.conn
+        self._read_pool: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=self.READ_POOL_SIZE)
+        self._read_opened = 0
+        self._read_lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def get_default(cls) -> "Database":
+        """Return the process-wide Database, opening and migrating it on first use."""
+        with cls._default_lock:
+            if cls._default is None:
+                database = cls(DB_PATH)
+                database.run_migrations()
+                cls._default = database
+            return cls._default
+
+    def _shared_connection(self, synchronous: Optional[str]) -> _SharedConnection:
+        if str(self.path) == ":memory:":
+            mode = _synchronous_mode(synchronous or "NORMAL")
+            conn = sqlite3.connect(self.path, cached_statements=STATEMENT_CACHE_SIZE)
+            _configure_connection(conn, synchronous=mode)
+            return _SharedConnection(conn, mode)
+        with _CONN_CACHE_LOCK:
+            key = self.path.resolve()
+            shared = _CONN_CACHE.get(key)
+            if shared is None:
+                ensure_runtime_dirs()
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # write_conn() serializes writers, so any thread may use it.
+                conn = sqlite3.connect(
+                    self.path,
+                    check_same_thread=False,
+                    cached_statements=STATEMENT_CACHE_SIZE,
+                )
+                mode = _synchronous_mode(synchronous or "NORMAL")
+                _configure_connection(conn, synchronous=mode)
+                shared = _CONN_CACHE[key] = _SharedConnection(conn, mode)
+            elif synchronous is not None and _synchronous_mode(synchronous) != shared.synchronous:
+                # The writer is shared by every handle on this path; changing its
+                # durability here would silently affect all of them.
+                raise ValueError(
+                    f"{self.path} is already open with synchronous={shared.synchronous}"
+                )
+            return shared
+
+    # -- catalog cache invalidation ------------------------------------
+    @property
+    def catalog_version(self) -> int:
+        """Counter bumped by catalog repositories whenever reference data changes."""
+        return self._shared.catalog_version
+
+    def bump_catalog_version(self) -> None:
+        self._shared.catalog_version += 1
 
     def close(self) -> None:
+        """Release this handle; the shared writer stays open until shutdown()."""
+        with Database._default_lock:
+            if Database._default is self:
+                Database._default = None
+        with self._read_lock:
+            self._closed = True
+            while True:
+                try:
+                    conn = self._read_pool.get_nowait()
+                except queue.Empty:
+                    break
+                self._read_opened -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        if str(self.path) == ":memory:":
+            self._close_writer()
+
+    def shutdown(self) -> None:
+        """Close this handle and the shared writer connection for its path."""
+        self.close()
+        if str(self.path) != ":memory:":
+            with _CONN_CACHE_LOCK:
+                if _CONN_CACHE.get(self.path.resolve()) is self._shared:
+                    del _CONN_CACHE[self.path.resolve()]
+            self._close_writer()
+
+    def _close_writer(self) -> None:
+        # Refresh planner stats and fold the WAL back in so the next open
+        # starts from a small log; both are best-effort on the way out.
+        try:
+            self.conn.execute("PRAGMA analysis_limit = 400")
+            self.conn.execute("PRAGMA optimize")
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except Exception:
+            pass
         try:
             self.conn.close()
         except Exception:
@@ -38,6 +173,78 @@ class Database:
     def cursor(self) -> sqlite3.Cursor:
         return self.conn.cursor()
 
+    # -- writer ---------------------------------------------------------
+    @contextmanager
+    def write_conn(self) -> Iterator[sqlite3.Connection]:
+        """Hold the single writer for one transaction; commits on success.
+
+        Nested calls on the owning thread join the outer transaction.
+        """
+        shared = self._shared
+        with shared.write_lock:
+            shared.write_depth += 1
+            try:
+                if shared.write_depth > 1:
+                    yield self.conn
+                else:
+                    with self.conn:
+                        yield self.conn
+            finally:
+                shared.write_depth -= 1
+
+    # -- read pool ------------------------------------------------------
+    @contextmanager
+    def read_conn(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection; writes must keep using ``conn``."""
+        if str(self.path) == ":memory:":
+            yield self.conn
+            return
+        if self._closed:
+            raise RuntimeError("Database handle is closed")
+        conn, pooled = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn, pooled)
+
+    def _acquire_reader(self) -> tuple[sqlite3.Connection, bool]:
+        try:
+            return self._read_pool.get_nowait(), True
+        except queue.Empty:
+            pass
+        with self._read_lock:
+            pooled = self._read_opened < self.READ_POOL_SIZE
+            if pooled:
+                self._read_opened += 1
+        # Once every pooled reader is borrowed (nested read_conn() calls, or
+        # more threads than the pool), open a one-off reader instead of waiting.
+        try:
+            return self._open_reader(), pooled
+        except Exception:
+            if pooled:
+                with self._read_lock:
+                    self._read_opened -= 1
+            raise
+
+    def _release_reader(self, conn: sqlite3.Connection, pooled: bool) -> None:
+        with self._read_lock:
+            if pooled and not self._closed:
+                self._read_pool.put_nowait(conn)
+                return
+            if pooled:
+                self._read_opened -= 1
+        conn.close()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{self.path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        _configure_connection(conn)
+        return conn
+
     # -- migrations -----------------------------------------------------
     def run_migrations(self, migrations_dir: Path | str = MIGRATIONS_DIR) -> List[str]:
         """Apply any outstanding .sql migrations. Returns filenames that ran."""
@@ -45,25 +252,44 @@ class Database:
         migrations_dir.mkdir(parents=True, exist_ok=True)
         self._ensure_schema_table()
 
-        applied = self._applied_migrations()
+        scripts = sorted(migrations_dir.glob("*.sql"))
+        last, applied_count = self.conn.execute(
+            "SELECT MAX(filename), COUNT(*) FROM schema_migrations"
+        ).fetchone()
+        # When every file up to the newest recorded one is accounted for, those
+        # can be skipped by name alone; otherwise fall back to point lookups.
+        in_order = last is not None and applied_count == sum(
+            1 for script in scripts if script.name <= last
+        )
+        pending = [
+            script
+            for script in scripts
+            if last is None
+            or script.name > last
+            or not (in_order or self._is_applied(script.name))
+        ]
         applied_now: List[str] = []
+        if not pending:
+            return applied_now
 
-        for script in sorted(migrations_dir.glob("*.sql")):
-            if script.name in applied:
-                continue
-            sql = script.read_text(encoding="utf-8")
-            with self.conn:
-                previous_fk = self.conn.execute("PRAGMA foreign_keys").fetchone()[0]
-                try:
-                    self.conn.execute("PRAGMA foreign_keys = OFF")
-                    self.conn.executescript(sql)
-                    self.conn.execute(
-                        "INSERT INTO schema_migrations(filename, applied_at_utc) VALUES (?, ?)",
-                        (script.name, datetime.now(timezone.utc).isoformat()),
-                    )
-                finally:
-                    self.conn.execute(f"PRAGMA foreign_keys = {1 if previous_fk else 0}")
-            applied_now.append(script.name)
+        # Table rebuilds DROP tables that others cascade from, so enforcement
+        # stays off for the whole batch. The pragma is a no-op inside a
+        # transaction, hence it is toggled once around the loop; connections
+        # always run with enforcement on (_configure_connection), so restore ON.
+        with self._shared.write_lock:
+            self.conn.execute("PRAGMA foreign_keys = OFF")
+            try:
+                for script in pending:
+                    sql = script.read_text(encoding="utf-8")
+                    with self.conn:
+                        self.conn.executescript(sql)
+                        self.conn.execute(
+                            "INSERT INTO schema_migrations(filename, applied_at_utc) VALUES (?, ?)",
+                            (script.name, datetime.now(timezone.utc).isoformat()),
+                        )
+                    applied_now.append(script.name)
+            finally:
+                self.conn.execute("PRAGMA foreign_keys = ON")
 
         return applied_now
 
@@ -77,9 +303,11 @@ class Database:
             """
         )
 
-    def _applied_migrations(self) -> set[str]:
-        rows = self.conn.execute("SELECT filename FROM schema_migrations").fetchall()
-        return {row[0] for row in rows}
+    def _is_applied(self, filename: str) -> bool:
+        cur = self.conn.execute(
+            "SELECT 1 FROM schema_migrations WHERE filename = ?", (filename,)
+        )
+        return cur.fetchone() is not None
 
     # -- context manager ------------------------------------------------
     def __enter__(self) -> "Database":
@@ -87,3 +315,16 @@ class Database:
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
+
+
+@contextmanager
+def write_transaction(db_or_conn) -> Iterator[sqlite3.Connection]:
+    """Run one write through ``Database.write_conn()``, or on a bare connection."""
+    if isinstance(db_or_conn, Database):
+        with db_or_conn.write_conn() as conn:
+            yield conn
+    elif db_or_conn.in_transaction:
+        yield db_or_conn
+    else:
+        with db_or_conn:
+            yield db_or_conn
@@ -3,65 +3,124 @@
 """SQLite repository for managing groups."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import json
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 import sqlite3
 
+from .db import Database, write_transaction
+
+
+_LIST_SQL: Dict[str, str] = {
+    "name": "SELECT id, name FROM groups ORDER BY name",
+    "id": "SELECT id, name FROM groups ORDER BY id",
+}
+
 
 class SQLiteGroupsRepository:
-    def __init__(self, db_or_conn) -> None:
-        self._db = db_or_conn
+    _ALLOWED_ORDER = frozenset(_LIST_SQL)
 
-    def _conn(self) -> sqlite3.Connection:
+    def __init__(self, db_or_conn=None) -> None:
+        self._db = db_or_conn if db_or_conn is not None else Database.get_default()
         if isinstance(self._db, sqlite3.Connection):
-            return self._db
-        if hasattr(self._db, "conn"):
-            return self._db.conn
-        raise RuntimeError("SQLiteGroupsRepository expects Database or Connection.")
+            self._connection = self._db
+        elif hasattr(self._db, "conn"):
+            self._connection = self._db.conn
+        else:
+            raise RuntimeError("SQLiteGroupsRepository expects Database or Connection.")
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection
+
+    def _touch_catalog(self) -> None:
+        # Lets other repositories drop cached catalog lookups after a change.
+        if hasattr(self._db, "bump_catalog_version"):
+            self._db.bump_catalog_version()
+
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        if isinstance(self._db, Database):
+            with self._db.read_conn() as conn:
+                yield conn
+        else:
+            yield self._conn()
 
     def list_groups(self, *, order_by: str = "name") -> List[Dict[str, str]]:
-        cur = self._conn().execute(
-            f"SELECT id, name FROM groups ORDER BY {order_by}"
-        )
-        return [dict(row) for row in cur.fetchall()]
+        return [{"id": r[0], "name": r[1]} for r in self.list_groups_raw(order_by=order_by)]
+
+    def list_groups_raw(self, *, order_by: str = "name") -> List[Tuple[int, str]]:
+        """Return ``(id, name)`` tuples without building Row/dict objects."""
+        if order_by not in self._ALLOWED_ORDER:
+            raise ValueError(f"Unsupported order_by for groups: {order_by}")
+        with self._read_conn() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            return cur.execute(_LIST_SQL[order_by]).fetchall()
+
+    def list_groups_json(self, *, order_by: str = "name") -> str:
+        """Serialise ``list_groups`` straight from tuples, skipping the dicts."""
+        rows = self.list_groups_raw(order_by=order_by)
+        return "[" + ",".join(
+            f'{{"id":{r[0]},"name":{json.dumps(r[1])}}}' for r in rows
+        ) + "]"
 
     def get(self, group_id: int) -> Optional[Dict[str, str]]:
-        cur = self._conn().execute(
-            "SELECT id, name FROM groups WHERE id = ?", (group_id,)
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        with self._read_conn() as conn:
+            cur = conn.execute(
+                "SELECT id, name FROM groups WHERE id = ?", (group_id,)
+            )
+            row = cur.fetchone()
+        return {"id": row[0], "name": row[1]} if row else None
 
     def find_by_name(self, name: str) -> Optional[Dict[str, str]]:
-        cur = self._conn().execute(
-            "SELECT id, name FROM groups WHERE lower(name) = lower(?)",
-            (name,),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        with self._read_conn() as conn:
+            cur = conn.execute(
+                "SELECT id, name FROM groups WHERE lower(name) = lower(?)",
+                (name,),
+            )
+            row = cur.fetchone()
+        return {"id": row[0], "name": row[1]} if row else None
 
     def ensure(self, name: str) -> Dict[str, str]:
-        existing = self.find_by_name(name)
-        if existing:
-            return existing
-        new_id = self.create(name=name)
-        return {"id": new_id, "name": name}
+        with write_transaction(self._db) as conn:
+            row = conn.execute(
+                """
+                INSERT INTO groups(name) VALUES (?)
+                ON CONFLICT(lower(name)) DO NOTHING
+                RETURNING id, name
+                """,
+                (name,),
+            ).fetchone()
+            inserted = row is not None
+            if not inserted:
+                row = conn.execute(
+                    "SELECT id, name FROM groups WHERE lower(name) = lower(?)",
+                    (name,),
+                ).fetchone()
+        if inserted:
+            self._touch_catalog()
+        return {"id": row[0], "name": row[1]}
 
     def create(self, *, name: str) -> int:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute("INSERT INTO groups(name) VALUES (?)", (name,))
-            return cur.lastrowid
+        self._touch_catalog()
+        return cur.lastrowid
 
     def rename(self, group_id: int, name: str) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "UPDATE groups SET name = ? WHERE id = ?", (name, group_id)
             )
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
 
     def delete(self, group_id: int) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute("DELETE FROM groups WHERE id = ?", (group_id,))
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
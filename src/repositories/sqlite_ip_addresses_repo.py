@@ -3,68 +3,106 @@
 """SQLite repository for tracking unique IP address records."""
 from __future__ import annotations
 
+import bisect
+import json
 from typing import Dict, Optional
 
 from .db import Database
 
 
+def _ip_sort_key(value: str) -> tuple[int, int, str]:
+    """Mirror ``ORDER BY ip_numeric, ip_address`` (see 0005_ip_numeric.sql)."""
+    # Same rules as the generated column: digits and three dots only, every
+    # part non-empty, each part read as a decimal integer and OR-ed into place.
+    parts = value.split(".")
+    if len(parts) == 4 and all(part.isascii() and part.isdigit() for part in parts):
+        a, b, c, d = (int(part) for part in parts)
+        return (1, (a << 24) | (b << 16) | (c << 8) | d, value)
+    return (0, 0, value)
+
+
+_LIST_SQL: Dict[str, str] = {
+    "ip_address": "SELECT id, ip_address FROM ip_addresses ORDER BY ip_address",
+    "id": "SELECT id, ip_address FROM ip_addresses ORDER BY id",
+}
+
+
 class SQLiteIPAddressesRepository:
-    def __init__(self, database: Database) -> None:
+    _ALLOWED_ORDER = frozenset(_LIST_SQL)
+
+    def __init__(self, database: Database | None = None) -> None:
+        if database is None:
+            database = Database.get_default()
         if not isinstance(database, Database):
             raise RuntimeError("SQLiteIPAddressesRepository expects a Database instance.")
         self._db = database
         self._conn = database.conn
 
     def list_addresses(self, order_by: str = "ip_address") -> list[Dict[str, str]]:
-        cur = self._conn.execute(
-            f"SELECT id, ip_address FROM ip_addresses ORDER BY {order_by}"
-        )
-        return [dict(row) for row in cur.fetchall()]
+        return [
+            {"id": r[0], "ip_address": r[1]}
+            for r in self.list_addresses_raw(order_by=order_by)
+        ]
+
+    def list_addresses_raw(self, order_by: str = "ip_address") -> list[tuple[int, str]]:
+        """Return ``(id, ip_address)`` tuples without building Row/dict objects."""
+        if order_by not in self._ALLOWED_ORDER:
+            raise ValueError(f"Unsupported order_by for IP addresses: {order_by}")
+        with self._db.read_conn() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            return cur.execute(_LIST_SQL[order_by]).fetchall()
+
+    def list_addresses_json(self, order_by: str = "ip_address") -> str:
+        """Serialise ``list_addresses`` straight from tuples, skipping the dicts."""
+        rows = self.list_addresses_raw(order_by=order_by)
+        return "[" + ",".join(
+            f'{{"id":{r[0]},"ip_address":{json.dumps(r[1])}}}' for r in rows
+        ) + "]"
 
     def list_available(self, *, include: Optional[str] = None) -> list[str]:
-        rows = self._conn.execute("SELECT ip_address FROM ip_addresses").fetchall()
-        all_ips = [row["ip_address"] for row in rows if row["ip_address"]]
-        used = {
-            row["ip_address"]
-            for row in self._conn.execute(
-                "SELECT ip_address FROM items WHERE ip_address IS NOT NULL AND archived = 0"
+        with self._db.read_conn() as conn:
+            cur = conn.execute(
+                """
+                SELECT ip.ip_address
+                FROM ip_addresses AS ip
+                WHERE ip.ip_address IS NOT NULL
+                  AND ip.ip_address <> ''
+                  AND NOT EXISTS (
+                      SELECT 1 FROM items AS i
+                      WHERE i.ip_address = ip.ip_address
+                        AND i.archived = 0
+                        AND i.ip_address IS NOT ?
+                  )
+                ORDER BY ip.ip_numeric, ip.ip_address
+                """,
+                (include or None,),
             )
-        }
-        if include:
-            used.discard(include)
-        available = [ip for ip in all_ips if ip not in used]
-        if include and include not in available and include:
-            available.append(include)
-
-        def ip_key(value: str) -> tuple[int, ...]:
-            parts = value.split(".")
-            try:
-                return tuple(int(part) for part in parts)
-            except ValueError:
-                return tuple(value.encode("utf-8"))
-
-        available.sort(key=ip_key)
+            available = [row[0] for row in cur]
+        if include and include not in available:
+            keys = [_ip_sort_key(ip) for ip in available]
+            available.insert(bisect.bisect(keys, _ip_sort_key(include)), include)
         return available
 
     def find(self, ip_address: str) -> Optional[Dict[str, str]]:
-        cur = self._conn.execute(
-            "SELECT id, ip_address FROM ip_addresses WHERE ip_address = ?",
-            (ip_address.strip(),),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        with self._db.read_conn() as conn:
+            row = conn.execute(
+                "SELECT id, ip_address FROM ip_addresses WHERE ip_address = ?",
+                (ip_address.strip(),),
+            ).fetchone()
+        return {"id": row[0], "ip_address": row[1]} if row else None
 
     def get(self, ip_id: int) -> Optional[Dict[str, str]]:
-        cur = self._conn.execute(
-            "SELECT id, ip_address FROM ip_addresses WHERE id = ?",
-            (ip_id,),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        with self._db.read_conn() as conn:
+            row = conn.execute(
+                "SELECT id, ip_address FROM ip_addresses WHERE id = ?",
+                (ip_id,),
+            ).fetchone()
+        return {"id": row[0], "ip_address": row[1]} if row else None
 
     def create(self, ip_address: str) -> Dict[str, str]:
         normalized = ip_address.strip()
-        with self._conn:
+        with self._db.write_conn():
             cur = self._conn.execute(
                 "INSERT INTO ip_addresses(ip_address) VALUES (?)",
                 (normalized,),
@@ -73,18 +111,17 @@ class SQLiteIPAddressesRepository:
 
     def update(self, ip_id: int, *, ip_address: str) -> Dict[str, str]:
         normalized = ip_address.strip()
-        with self._conn:
-            self._conn.execute(
+        with self._db.write_conn():
+            cur = self._conn.execute(
                 "UPDATE ip_addresses SET ip_address = ? WHERE id = ?",
                 (normalized, ip_id),
             )
-        record = self.get(ip_id)
-        if record is None:
+        if cur.rowcount == 0:
             raise ValueError(f"IP address {ip_id} not found")
-        return record
+        return {"id": int(ip_id), "ip_address": normalized}
 
     def delete(self, ip_id: int) -> bool:
-        with self._conn:
+        with self._db.write_conn():
             cur = self._conn.execute(
                 "DELETE FROM ip_addresses WHERE id = ?",
                 (ip_id,),
@@ -92,7 +129,14 @@ class SQLiteIPAddressesRepository:
         return cur.rowcount > 0
 
     def ensure(self, ip_address: str) -> Dict[str, str]:
-        existing = self.find(ip_address)
-        if existing:
-            return existing
-        return self.create(ip_address)
+        # The no-op update makes RETURNING yield the existing row on conflict.
+        with self._db.write_conn():
+            row = self._conn.execute(
+                """
+                INSERT INTO ip_addresses(ip_address) VALUES (?)
+                ON CONFLICT(ip_address) DO UPDATE SET ip_address = excluded.ip_address
+                RETURNING id, ip_address
+                """,
+                (ip_address.strip(),),
+            ).fetchone()
+        return {"id": row[0], "ip_address": row[1]}
@@ -4,10 +4,20 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import string
+import warnings
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:  # Optional: orjson encodes audit snapshots several times faster.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 from src.models.item_record import ItemRecord
+from src.utils.timestamp import utc_timestamp
 
 from .db import Database
 from .sqlite_updates_repo import SQLiteUpdatesRepository
@@ -15,6 +25,175 @@ from .sqlite_updates_repo import SQLiteUpdatesRepository
 _UNSET = object()
 
 
+def _dumps(value: Any) -> str:
+    """Compact JSON text for audit snapshots."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+# Stable statement text so sqlite3's per-connection statement cache hits.
+_ITEM_FIELDS = (
+    "id",
+    "type_serial",
+    "name",
+    "model",
+    "type_id",
+    "mac_address",
+    "ip_address",
+    "location_id",
+    "user_id",
+    "group_id",
+    "sub_type_id",
+    "notes",
+    "extension",
+    "asset_tag",
+    "created_at_utc",
+    "updated_at_utc",
+    "archived",
+)
+_ITEM_COLUMNS = ", ".join(f"i.{field}" for field in _ITEM_FIELDS)
+# Lets UPDATE hand back the post-update row instead of a second SELECT.
+_RETURNING_ITEM_SQL = "RETURNING " + ", ".join(_ITEM_FIELDS)
+_SELECT_ITEM_SQL = f"SELECT {_ITEM_COLUMNS} FROM items AS i WHERE i.id = ?"
+_INSERT_ITEM_SQL = f"""
+    INSERT INTO items(
+        type_serial, name, model, type_id, mac_address,
+        ip_address, location_id, user_id, group_id,
+        sub_type_id, notes, extension, asset_tag
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    {_RETURNING_ITEM_SQL}
+"""
+_ARCHIVE_ITEM_SQL = """
+    UPDATE items
+       SET archived = 1,
+           ip_address = NULL,
+           updated_at_utc = ?
+     WHERE id = ?
+"""
+_ARCHIVE_COLUMNS = (
+    "id",
+    "name",
+    "model",
+    "type_id",
+    "mac_address",
+    "ip_address",
+    "location_id",
+    "user_id",
+    "group_id",
+    "sub_type_id",
+    "notes",
+    "asset_tag",
+    "created_at_utc",
+    "updated_at_utc",
+    "archived",
+)
+_ARCHIVE_UPDATE_CLAUSE = ", ".join(
+    f"{column} = excluded.{column}" for column in _ARCHIVE_COLUMNS if column != "asset_tag"
+)
+_ARCHIVE_UPSERT_SQL = f"""
+    INSERT INTO archive({', '.join(_ARCHIVE_COLUMNS)})
+    VALUES ({', '.join('?' for _ in _ARCHIVE_COLUMNS)})
+    ON CONFLICT(asset_tag) DO UPDATE SET {_ARCHIVE_UPDATE_CLAUSE}
+"""
+_DELETE_ITEM_SQL = "DELETE FROM items WHERE id = ?"
+_SELECT_ARCHIVE_ROWS_SQL = f"""
+    SELECT {', '.join(_ARCHIVE_COLUMNS[:-2])}
+    FROM items WHERE id IN (SELECT value FROM json_each(?))
+"""
+_DELETE_ITEMS_SQL = "DELETE FROM items WHERE id IN (SELECT value FROM json_each(?))"
+# Conflicting asset tag (if any) and pool membership for an IP in one pass.
+_IP_CHECK_SQL = """
+    SELECT
+        (SELECT asset_tag FROM items WHERE ip_address = ?1 AND id IS NOT ?2),
+        EXISTS(SELECT 1 FROM ip_addresses WHERE ip_address = ?1)
+"""
+# Orderable columns and their SQL sort keys; text sorts case-insensitively
+# through the lower() expression indexes from 0010_items_sort_indexes.sql.
+_ORDER_COLUMNS = {
+    **{
+        column: f"i.{column}"
+        for column in (
+            "id",
+            "type_serial",
+            "type_id",
+            "mac_address",
+            "ip_address",
+            "location_id",
+            "user_id",
+            "group_id",
+            "sub_type_id",
+            "extension",
+            "asset_tag",
+            "created_at_utc",
+            "updated_at_utc",
+            "archived",
+        )
+    },
+    **{column: f"lower(i.{column})" for column in ("name", "model", "notes")},
+}
+# Precomputed _parse_order results for the spellings callers actually use.
+_ORDER_LOOKUP = {
+    f"{prefix}{column}{suffix}": (column, suffix == " DESC")
+    for column in _ORDER_COLUMNS
+    for prefix in ("", "i.", "hi.")
+    for suffix in ("", " ASC", " DESC")
+}
+# Drops separators and uppercases in a single translate pass.
+_MAC_TABLE = str.maketrans(string.ascii_lowercase, string.ascii_uppercase, "-:")
+# The trigram tokenizer cannot match fewer than three characters.
+_FTS_MIN_QUERY = 3
+# Claims the next per-type serial in one statement, seeding the counter.
+_NEXT_SERIAL_SQL = """
+    INSERT INTO type_counters(type_id, next_serial) VALUES (?, 2)
+    ON CONFLICT(type_id) DO UPDATE SET next_serial = next_serial + 1
+    RETURNING next_serial - 1
+"""
+_TYPE_CODES_SQL = "SELECT id, code FROM hardware_types"
+_TYPE_ID_BY_CODE_SQL = "SELECT id FROM hardware_types WHERE code = ?"
+_METADATA_SQL = """
+    SELECT 't', id, name, code FROM hardware_types
+    UNION ALL SELECT 'l', id, name, NULL FROM locations
+    UNION ALL SELECT 'u', id, name, email FROM users
+    UNION ALL SELECT 'g', id, name, NULL FROM groups
+    UNION ALL SELECT 's', id, name, NULL FROM sub_types
+"""
+
+_SEARCH_LIKE_SQL = """
+    (
+        lower(i.name) LIKE ?
+        OR lower(COALESCE(i.model, '')) LIKE ?
+        OR lower(COALESCE(i.mac_address, '')) LIKE ?
+        OR lower(i.asset_tag) LIKE ?
+    )
+"""
+_SEARCH_FTS_SQL = "i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)"
+
+
+@lru_cache(maxsize=256)
+def _list_sql(
+    filter_columns: Tuple[str, ...],
+    search_sql: Optional[str],
+    order_column: str,
+    descending: bool,
+) -> str:
+    """list_records SQL for one filter shape; order_column is pre-validated."""
+    # json_each keeps the text independent of list sizes, so the shape alone
+    # determines the statement and sqlite3's statement cache keeps hitting.
+    where = ["i.archived = 0"]
+    where.extend(f"{column} IN (SELECT value FROM json_each(?))" for column in filter_columns)
+    if search_sql:
+        where.append(search_sql)
+    return f"""
+        SELECT {_ITEM_COLUMNS}
+        FROM items AS i
+        WHERE {' AND '.join(where)}
+        ORDER BY {_ORDER_COLUMNS[order_column]} {'DESC' if descending else 'ASC'}
+        LIMIT ?
+    """
+
+
 class SQLiteItemsRepository:
     """CRUD operations plus audit recording for inventory items."""
 
@@ -37,6 +216,7 @@ class SQLiteItemsRepository:
         database: Database,
         *,
         updates_repo: SQLiteUpdatesRepository | None = None,
+        audit_snapshots: bool = True,
     ) -> None:
         if not isinstance(database, Database):
             raise RuntimeError("SQLiteItemsRepository expects a Database instance.")
@@ -44,7 +224,13 @@ class SQLiteItemsRepository:
         self._db = database
         self._conn = database.conn
         self._updates = updates_repo or SQLiteUpdatesRepository(database)
+        # Off: audit rows keep reason/note/changed_fields but store no JSON
+        # snapshots, for deployments that never show the history diff.
+        self._audit_snapshots = audit_snapshots
         self._landline_type_id_cache: Optional[int] = None
+        self._type_codes_cache: Optional[Dict[int, str]] = None
+        self._type_codes_version = -1
+        self._metadata_cache: Optional[tuple[int, Dict[str, Dict[int, Dict[str, Any]]]]] = None
 
     # ---- queries -----------------------------------------------------
     def list_records(
@@ -58,81 +244,31 @@ class SQLiteItemsRepository:
         search: Optional[str] = None,
         limit: int = 500,
     ) -> List[ItemRecord]:
-        type_filter = self._normalize_ids(type_ids)
-        location_filter = self._normalize_ids(location_ids)
-        user_filter = self._normalize_ids(user_ids)
-        group_filter = self._normalize_ids(group_ids)
-
-        where: List[str] = ["i.archived = 0"]
+        filter_columns: List[str] = []
         params: List[Any] = []
-
-        if type_filter:
-            placeholders = ", ".join("?" for _ in type_filter)
-            where.append(f"i.type_id IN ({placeholders})")
-            params.extend(type_filter)
-        if location_filter:
-            placeholders = ", ".join("?" for _ in location_filter)
-            where.append(f"i.location_id IN ({placeholders})")
-            params.extend(location_filter)
-        if user_filter:
-            placeholders = ", ".join("?" for _ in user_filter)
-            where.append(f"i.user_id IN ({placeholders})")
-            params.extend(user_filter)
-        if group_filter:
-            placeholders = ", ".join("?" for _ in group_filter)
-            where.append(f"i.group_id IN ({placeholders})")
-            params.extend(group_filter)
-
-        if search:
+        self._add_in_filter(filter_columns, params, "i.type_id", type_ids)
+        self._add_in_filter(filter_columns, params, "i.location_id", location_ids)
+        self._add_in_filter(filter_columns, params, "i.user_id", user_ids)
+        self._add_in_filter(filter_columns, params, "i.group_id", group_ids)
+
+        search_sql: Optional[str] = None
+        if search and len(search) >= _FTS_MIN_QUERY:
+            # Quoted so punctuation in tags/MACs is matched literally.
+            search_sql = _SEARCH_FTS_SQL
+            params.append('"' + search.replace('"', '""') + '"')
+        elif search:
+            search_sql = _SEARCH_LIKE_SQL
             like = f"%{search.lower()}%"
-            where.append(
-                """
-                (
-                    lower(i.name) LIKE ?
-                    OR lower(COALESCE(i.model, '')) LIKE ?
-                    OR lower(COALESCE(i.mac_address, '')) LIKE ?
-                    OR lower(i.asset_tag) LIKE ?
-                )
-                """
-            )
             params.extend([like, like, like, like])
 
-        clause = "WHERE " + " AND ".join(where) if where else ""
-
         column, descending = self._parse_order(order_by)
-        direction = "DESC" if descending else "ASC"
-
-        sql = f"""
-            SELECT
-                i.id,
-                i.type_serial,
-                i.name,
-                i.model,
-                i.type_id,
-                i.mac_address,
-                i.ip_address,
-                i.location_id,
-                i.user_id,
-                i.group_id,
-                i.sub_type_id,
-                i.notes,
-                i.extension,
-                i.asset_tag,
-                i.created_at_utc,
-                i.updated_at_utc,
-                i.archived
-            FROM items AS i
-            {clause}
-            ORDER BY {column} {direction}
-            LIMIT ?
-        """
+        sql = _list_sql(tuple(filter_columns), search_sql, column, descending)
         params.append(limit)
 
-        metadata = self._metadata_maps()
-        return [
-            ItemRecord.from_row(row, metadata)
-            for row in self._conn.execute(sql, params).fetchall()
-        ]
+        with self._db.read_conn() as conn:
+            metadata = self._metadata_maps(conn)
+            rows = conn.execute(sql, params).fetchall()
+        return ItemRecord.from_rows(rows, metadata)
 
     def list_items(
         self,
@@ -159,7 +295,8 @@ class SQLiteItemsRepository:
         ]
 
     def get(self, item_id: int) -> Optional[Dict[str, Any]]:
-        record = self._get_record(item_id)
+        with self._db.read_conn() as conn:
+            record = self._get_record(item_id, conn)
         return record.as_dict() if record else None
 
     def get_details(self, item_id: int) -> Optional[Dict[str, Any]]:
@@ -182,54 +319,90 @@ class SQLiteItemsRepository:
         extension: Optional[str] = None,
         note: Optional[str] = None,
     ) -> Dict[str, Any]:
-        if ip_address is _UNSET:
-            ip_address = None
-        mac_norm = self._normalize_mac(mac_address)
-        ip_norm = self._normalize_ip(ip_address)
-        self._ensure_ip_available(ip_norm)
-        self._assert_ip_exists(ip_norm)
+        with self._db.write_conn():
+            return self._insert_item(
+                name=name,
+                type_id=type_id,
+                model=model,
+                mac_norm=self._normalize_mac(mac_address),
+                ip_address=ip_address,
+                location_id=location_id,
+                user_id=user_id,
+                group_id=group_id,
+                sub_type_id=sub_type_id,
+                notes=notes,
+                extension=extension,
+                note=note,
+            )
 
-        extension_clean = self._clean_extension(type_id, extension)
+    def create_many(self, items: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several items (``create`` keyword mappings) in one transaction.
 
-        with self._conn:
-            type_serial = self._next_type_serial(type_id)
-            asset_tag = self._asset_tag_for(type_id=type_id, type_serial=type_serial)
-            cur = self._conn.execute(
-                """
-                INSERT INTO items(
-                    type_serial, name, model, type_id, mac_address,
-                    ip_address, location_id, user_id, group_id,
-                    sub_type_id, notes, extension, asset_tag
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    type_serial,
-                    name,
-                    model,
-                    type_id,
-                    mac_norm,
-                    ip_norm,
-                    location_id,
-                    user_id,
-                    group_id,
-                    sub_type_id,
-                    notes,
-                    extension_clean,
-                    asset_tag,
-                ),
-            )
-            item_id = int(cur.lastrowid)
+        All-or-nothing: the first invalid item raises and rolls back the batch.
+        """
+        items = list(items)
+        macs = self._normalize_macs_bulk([item.get("mac_address") for item in items])
+        created: List[Dict[str, Any]] = []
+        with self._db.write_conn():
+            for item, mac_norm in zip(items, macs):
+                fields = dict(item)
+                fields.pop("mac_address", None)
+                created.append(self._insert_item(mac_norm=mac_norm, **fields))
+        return created
+
+    def _insert_item(
+        self,
+        *,
+        name: str,
+        type_id: int,
+        mac_norm: Optional[str],
+        model: Optional[str] = None,
+        ip_address: object = _UNSET,
+        location_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        group_id: Optional[int] = None,
+        sub_type_id: Optional[int] = None,
+        notes: Optional[str] = None,
+        extension: Optional[str] = None,
+        note: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Insert one item plus its audit row; the caller holds write_conn()."""
+        ip_norm = self._normalize_ip(ip_address)
+        self._check_ip(ip_norm)
+        extension_clean = self._clean_extension(type_id, extension)
 
-        record = self._get_record(item_id)
-        item = record.as_dict() if record else {}
+        type_serial = self._next_type_serial(type_id)
+        asset_tag = self._asset_tag_for(type_id=type_id, type_serial=type_serial)
+        row = self._conn.execute(
+            _INSERT_ITEM_SQL,
+            (
+                type_serial,
+                name,
+                model,
+                type_id,
+                mac_norm,
+                ip_norm,
+                location_id,
+                user_id,
+                group_id,
+                sub_type_id,
+                notes,
+                extension_clean,
+                asset_tag,
+            ),
+        ).fetchone()
+        item = ItemRecord.from_row(row, self._metadata_maps()).as_dict()
         self._record_audit(
-            item_id=item_id,
+            item_id=item["id"],
             type_id=type_id,
             reason="create",
             note=note,
             changed_fields=self._AUDIT_FIELDS,
-            snapshot_after=item,
+            snapshot_after={
+                column: item[column]
+                for column in self._AUDIT_FIELDS
+                if item.get(column) is not None
+            },
         )
         return item
 
@@ -250,11 +423,13 @@ class SQLiteItemsRepository:
         extension: Optional[str] = _UNSET,
         note: Optional[str] = None,
         reason: str = "update",
+        _before: Optional[ItemRecord] = None,
     ) -> bool:
-        before_record = self._get_record(item_id)
-        if not before_record:
+        # assign/move pass the row they already loaded; they hold no state
+        # between that read and this call, so it is as fresh as a re-read.
+        before = _before or self._get_record(item_id)
+        if not before:
             raise ValueError(f"Item {item_id} not found")
-        before = before_record.as_dict()
 
         fields: Dict[str, Any] = {}
         if name is not None:
@@ -281,138 +456,114 @@ class SQLiteItemsRepository:
         if not fields and note is None:
             return False
 
-        if "ip_address" in fields:
-            self._ensure_ip_available(
-                fields["ip_address"],
-                exclude_item=item_id,
-            )
-            self._assert_ip_exists(fields["ip_address"])
-
-        type_changed = "type_id" in fields and fields["type_id"] != before["type_id"]
-        new_type_id = fields["type_id"] if type_changed else before["type_id"]
+        type_changed = "type_id" in fields and fields["type_id"] != before.type_id
+        new_type_id = fields["type_id"] if type_changed else before.type_id
 
         if extension is not _UNSET:
             fields["extension"] = self._clean_extension(new_type_id, extension)
         elif type_changed and new_type_id != self._landline_type_id():
             fields["extension"] = None
 
-        with self._conn:
+        # Values that already match are dropped before any SQL, so an
+        # unchanged save neither rewrites the row nor bumps updated_at_utc.
+        fields = {
+            column: value
+            for column, value in fields.items()
+            if getattr(before, column) != value
+        }
+        if not fields and note is None:
+            return False
+
+        if "ip_address" in fields:
+            self._check_ip(fields["ip_address"], exclude_item=item_id)
+
+        with self._db.write_conn():
             updates: List[str] = []
             params: List[Any] = []
 
             if type_changed:
                 new_type_serial = self._next_type_serial(new_type_id)
                 fields["type_serial"] = new_type_serial
+                fields["asset_tag"] = self._asset_tag_for(
+                    type_id=new_type_id,
+                    type_serial=new_type_serial,
+                )
 
             for column, value in fields.items():
                 updates.append(f"{column} = ?")
                 params.append(value)
 
             if updates:
+                updates.append("updated_at_utc = ?")
+                params.append(utc_timestamp())
                 params.append(item_id)
-                self._conn.execute(
-                    f"UPDATE items SET {', '.join(updates)} WHERE id = ?",
+                row = self._conn.execute(
+                    f"UPDATE items SET {', '.join(updates)} WHERE id = ? "
+                    + _RETURNING_ITEM_SQL,
                     params,
+                ).fetchone()
+                after = ItemRecord.from_row(row, self._metadata_maps())
+            else:
+                after = before
+            # Compared on the records themselves; dicts are only built for
+            # the keys that end up in the audit snapshots.
+            diff = before.changed_fields(after)
+            changed_columns = [column for column in self._AUDIT_FIELDS if column in diff]
+
+            if changed_columns or note:
+                # Snapshots carry only the keys that moved (including derived
+                # ones such as asset_tag and display names), not the whole row.
+                self._record_audit(
+                    item_id=item_id,
+                    type_id=new_type_id,
+                    reason=reason,
+                    note=note,
+                    changed_fields=changed_columns or None,
+                    snapshot_before={key: getattr(before, key) for key in diff},
+                    snapshot_after={key: getattr(after, key) for key in diff},
                 )
-                if type_changed:
-                    asset_tag = self._asset_tag_for(
-                        type_id=new_type_id,
-                        type_serial=new_type_serial,
-                    )
-                    self._conn.execute(
-                        "UPDATE items SET asset_tag = ? WHERE id = ?",
-                        (asset_tag, item_id),
-                    )
-
-        after_record = self._get_record(item_id)
-        after = after_record.as_dict() if after_record else None
-        changed_columns = [
-            column
-            for column in self._AUDIT_FIELDS
-            if before.get(column) != (after or {}).get(column)
-        ]
-
-        if changed_columns or note:
-            self._record_audit(
-                item_id=item_id,
-                type_id=new_type_id,
-                reason=reason,
-                note=note,
-                changed_fields=changed_columns or None,
-                snapshot_before=before,
-                snapshot_after=after,
-            )
         return bool(changed_columns)
 
     def delete(self, item_id: int, *, note: Optional[str] = None) -> bool:
-        before_record = self._get_record(item_id)
-        if not before_record:
+        if note is not None:
+            warnings.warn(
+                "delete(note=...) is deprecated and ignored: a deleted item keeps no "
+                "history, only its archive row",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        before = self._get_record(item_id)
+        if not before:
             return False
-        before = before_record.as_dict()
 
         now = datetime.now(timezone.utc).isoformat()
-        archive_columns = (
-            "id",
-            "name",
-            "model",
-            "type_id",
-            "mac_address",
-            "ip_address",
-            "location_id",
-            "user_id",
-            "group_id",
-            "sub_type_id",
-            "notes",
-            "asset_tag",
-            "created_at_utc",
-            "updated_at_utc",
-            "archived",
-        )
         archive_values = [
-            before.get("id"),
-            before.get("name"),
-            before.get("model"),
-            before.get("type_id"),
-            before.get("mac_address"),
-            before.get("ip_address"),
-            before.get("location_id"),
-            before.get("user_id"),
-            before.get("group_id"),
-            before.get("sub_type_id"),
-            before.get("notes"),
-            before.get("asset_tag"),
-            before.get("created_at_utc"),
-            now,
-            1,
-        ]
+            getattr(before, column) for column in _ARCHIVE_COLUMNS[:-2]
+        ] + [now, 1]
 
-        placeholders = ", ".join("?" for _ in archive_columns)
-        update_clause = ", ".join(
-            f"{column} = excluded.{column}" for column in archive_columns if column != "asset_tag"
-        )
+        with self._db.write_conn():
+            self._conn.execute(_ARCHIVE_UPSERT_SQL, archive_values)
+            self._conn.execute(_DELETE_ITEM_SQL, (item_id,))
 
-        with self._conn:
-            self._conn.execute(
-                f"""
-                INSERT INTO archive({', '.join(archive_columns)})
-                VALUES ({placeholders})
-                ON CONFLICT(asset_tag) DO UPDATE SET {update_clause}
-                """,
-                archive_values,
-            )
-            self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
-
-        self._record_audit(
-            item_id=item_id,
-            type_id=before["type_id"],
-            reason="delete",
-            note=note,
-            changed_fields=["archived"],
-            snapshot_before=before,
-            snapshot_after=None,
-        )
+        # item_updates cascades with the item, so the archive row is the only
+        # record of a delete; an audit row here would violate the foreign key.
         return True
 
+    def delete_many(self, item_ids: Iterable[int]) -> int:
+        """Archive and delete several items in one transaction; returns the count."""
+        ids = json.dumps(self._normalize_ids(item_ids))
+        now = datetime.now(timezone.utc).isoformat()
+        with self._db.write_conn():
+            archive_rows = [
+                (*row, now, 1)
+                for row in self._conn.execute(_SELECT_ARCHIVE_ROWS_SQL, (ids,))
+            ]
+            if not archive_rows:
+                return 0
+            self._conn.executemany(_ARCHIVE_UPSERT_SQL, archive_rows)
+            self._conn.execute(_DELETE_ITEMS_SQL, (ids,))
+        return len(archive_rows)
+
     def assign(
         self,
         item_id: int,
@@ -422,20 +573,25 @@ class SQLiteItemsRepository:
         note: Optional[str] = None,
     ) -> bool:
         before_record = self._get_record(item_id)
-        if not before_record:
+        if before_record is None:
             raise ValueError(f"Item {item_id} not found")
-        before = before_record.as_dict()
 
         updates: Dict[str, Any] = {}
-        if user_id is not None or (user_id is None and before.get("user_id") is not None):
+        if user_id != before_record.user_id:
             updates["user_id"] = user_id
-        if group_id is not None or (group_id is None and before.get("group_id") is not None):
+        if group_id != before_record.group_id:
             updates["group_id"] = group_id
 
         if not updates:
             return False
 
-        self.update(item_id, **updates, reason="assign", note=note)
+        self.update(
+            item_id,
+            **updates,
+            reason="assign",
+            note=note,
+            _before=before_record,
+        )
         return True
 
     def move_location(
@@ -446,14 +602,18 @@ class SQLiteItemsRepository:
         note: Optional[str] = None,
     ) -> bool:
         before_record = self._get_record(item_id)
-        if not before_record:
+        if before_record is None:
             raise ValueError(f"Item {item_id} not found")
-        before = before_record.as_dict()
-
-        if before.get("location_id") == location_id:
+        if before_record.location_id == location_id:
             return False
 
-        self.update(item_id, location_id=location_id, reason="move", note=note)
+        self.update(
+            item_id,
+            location_id=location_id,
+            reason="move",
+            note=note,
+            _before=before_record,
+        )
         return True
 
     def add_audit_note(self, item_id: int, note: str) -> int:
@@ -479,81 +639,113 @@ class SQLiteItemsRepository:
         if before.get("archived"):
             return False
 
-        now = datetime.now(timezone.utc).isoformat()
-        with self._conn:
-            self._conn.execute(
-                """
-                UPDATE items
-                   SET archived = 1,
-                       ip_address = NULL,
-                       updated_at_utc = ?
-                 WHERE id = ?
-                """,
-                (now, item_id),
+        now = utc_timestamp()
+        with self._db.write_conn():
+            self._conn.execute(_ARCHIVE_ITEM_SQL, (now, item_id))
+            after_record = self._get_record(item_id)
+            after = after_record.as_dict() if after_record else None
+            self._record_audit(
+                item_id=item_id,
+                type_id=before["type_id"],
+                reason="archive",
+                note=note,
+                changed_fields=["archived"],
+                snapshot_before=before,
+                snapshot_after=after,
             )
-        after_record = self._get_record(item_id)
-        after = after_record.as_dict() if after_record else None
-        self._record_audit(
-            item_id=item_id,
-            type_id=before["type_id"],
-            reason="archive",
-            note=note,
-            changed_fields=["archived"],
-            snapshot_before=before,
-            snapshot_after=after,
-        )
         return True
 
+    def invalidate_type_codes(self) -> None:
+        """Forget cached catalog data after hardware_types changed outside the repos."""
+        self._type_codes_cache = None
+        self._landline_type_id_cache = None
+        self._metadata_cache = None
+        # Other repositories on this database cache the same catalog.
+        self._db.bump_catalog_version()
+
     # ---- internal helpers -------------------------------------------
-    def _metadata_maps(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
-        types = {
-            int(row["id"]): {"name": row["name"], "code": row["code"]}
-            for row in self._conn.execute("SELECT id, name, code FROM hardware_types")
-        }
-        locations = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM locations")
-        }
-        users = {
-            int(row["id"]): {"name": row["name"], "email": row["email"]}
-            for row in self._conn.execute("SELECT id, name, email FROM users")
-        }
-        groups = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM groups")
-        }
-        sub_types = {
-            int(row["id"]): {"name": row["name"]}
-            for row in self._conn.execute("SELECT id, name FROM sub_types")
-        }
-        return {
-            "types": types,
-            "locations": locations,
-            "users": users,
-            "groups": groups,
-            "sub_types": sub_types,
+    def _metadata_maps(
+        self, conn: Optional[sqlite3.Connection] = None
+    ) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        version = self._db.catalog_version
+        if self._metadata_cache is not None and self._metadata_cache[0] == version:
+            return self._metadata_cache[1]
+
+        maps: Dict[str, Dict[int, Dict[str, Any]]] = {
+            "types": {},
+            "locations": {},
+            "users": {},
+            "groups": {},
+            "sub_types": {},
         }
+        types, locations, users, groups, sub_types = maps.values()
+        for kind, row_id, name, extra in (conn or self._conn).execute(_METADATA_SQL):
+            if kind == "t":
+                types[int(row_id)] = {"name": name, "code": extra}
+            elif kind == "l":
+                locations[int(row_id)] = {"name": name}
+            elif kind == "u":
+                users[int(row_id)] = {"name": name, "email": extra}
+            elif kind == "g":
+                groups[int(row_id)] = {"name": name}
+            else:
+                sub_types[int(row_id)] = {"name": name}
+        self._metadata_cache = (version, maps)
+        return maps
 
     def _parse_order(self, order_by: str) -> tuple[str, bool]:
+        parsed = _ORDER_LOOKUP.get(order_by)
+        if parsed is not None:
+            return parsed
         clause = (order_by or "").strip() or "updated_at_utc DESC"
         parts = clause.split()
         column = parts[0]
         if "." in column:
             column = column.split(".")[-1]
+        if column not in _ORDER_COLUMNS:
+            raise ValueError(f"Unsupported order column: {column}")
         direction = parts[1].upper() if len(parts) > 1 else "ASC"
         descending = direction == "DESC"
         return column, descending
 
+    def _add_in_filter(
+        self,
+        filter_columns: List[str],
+        params: List[Any],
+        column: str,
+        ids: Optional[Iterable[int]],
+    ) -> None:
+        """Normalize ``ids`` once and bind them as a single json_each parameter."""
+        values = self._normalize_ids(ids)
+        if values:
+            filter_columns.append(column)
+            params.append(json.dumps(values))
+
     def _normalize_ids(self, ids: Optional[Iterable[int]]) -> List[int]:
         if not ids:
             return []
-        return sorted({int(i) for i in ids if i is not None})
+        if type(ids) is list and all(type(i) is int for i in ids):
+            # Already clean: json_each tolerates duplicates, so pass it through.
+            return ids
+        # Order is irrelevant to IN (...); keep first-seen order, skip the sort.
+        return list(dict.fromkeys(int(i) for i in ids if i is not None))
 
     @staticmethod
     def _normalize_mac(mac: Optional[str]) -> Optional[str]:
         if mac is None:
             return None
-        return mac.replace("-", "").replace(":", "").upper()
+        return mac.translate(_MAC_TABLE)
+
+    @staticmethod
+    def _normalize_macs_bulk(macs: List[Optional[str]]) -> List[Optional[str]]:
+        """Batch _normalize_mac: one translate over the joined values."""
+        present = [mac for mac in macs if mac is not None]
+        joined = "\n".join(present)
+        if joined.count("\n") != max(len(present) - 1, 0):
+            # A value carries the separator itself; fall back to per-value.
+            return [SQLiteItemsRepository._normalize_mac(mac) for mac in macs]
+        normalized = iter(joined.translate(_MAC_TABLE).split("\n"))
+        return [next(normalized) if mac is not None else None for mac in macs]
 
     @staticmethod
     def _normalize_ip(ip: object) -> Optional[str]:
@@ -562,65 +754,39 @@ class SQLiteItemsRepository:
         value = str(ip).strip()
         return value or None
 
-    def _ensure_ip_available(self, ip: Optional[str], *, exclude_item: Optional[int] = None) -> None:
+    def _check_ip(self, ip: Optional[str], *, exclude_item: Optional[int] = None) -> None:
         if not ip:
             return
-        query = "SELECT id, asset_tag FROM items WHERE ip_address = ?"
-        params: List[Any] = [ip]
-        if exclude_item is not None:
-            query += " AND id != ?"
-            params.append(int(exclude_item))
-        row = self._conn.execute(query, params).fetchone()
-        if row:
-            raise ValueError(
-                f"IP address {ip} is already assigned to asset {row['asset_tag']}"
-            )
-
-    def _assert_ip_exists(self, ip: Optional[str]) -> None:
-        if not ip:
-            return
-        exists = self._conn.execute(
-            "SELECT 1 FROM ip_addresses WHERE ip_address = ?",
-            (ip,),
-        ).fetchone()
-        if exists is None:
+        exclude = int(exclude_item) if exclude_item is not None else None
+        assigned_tag, exists = self._conn.execute(_IP_CHECK_SQL, (ip, exclude)).fetchone()
+        if assigned_tag is not None:
+            raise ValueError(f"IP address {ip} is already assigned to asset {assigned_tag}")
+        if not exists:
             raise ValueError(f"IP address {ip} does not exist in ip_addresses table")
 
     def _asset_tag_for(self, *, type_id: int, type_serial: int) -> str:
-        code = self._conn.execute(
-            "SELECT code FROM hardware_types WHERE id = ?",
-            (type_id,),
-        ).fetchone()
+        code = self._type_codes().get(type_id)
         if code is None:
             raise ValueError(f"hardware_type id {type_id} not found")
-        return f"SDMM-{code['code']}-{type_serial:04d}"
+        return f"SDMM-{code}-{type_serial:04d}"
+
+    def _type_codes(self) -> Dict[int, str]:
+        version = self._db.catalog_version
+        if self._type_codes_cache is None or self._type_codes_version != version:
+            self._type_codes_cache = {
+                int(row[0]): row[1]
+                for row in self._conn.execute(_TYPE_CODES_SQL)
+            }
+            self._type_codes_version = version
+        return self._type_codes_cache
 
     def _next_type_serial(self, type_id: int) -> int:
-        row = self._conn.execute(
-            "SELECT next_serial FROM type_counters WHERE type_id = ?",
-            (type_id,),
-        ).fetchone()
-        if row is None:
-            next_serial = 1
-            self._conn.execute(
-                "INSERT INTO type_counters(type_id, next_serial) VALUES (?, ?)",
-                (type_id, 2),
-            )
-            return next_serial
-
-        next_serial = int(row["next_serial"])
-        self._conn.execute(
-            "UPDATE type_counters SET next_serial = ? WHERE type_id = ?",
-            (next_serial + 1, type_id),
-        )
-        return next_serial
+        row = self._conn.execute(_NEXT_SERIAL_SQL, (type_id,)).fetchone()
+        return int(row[0])
 
     def _landline_type_id(self) -> Optional[int]:
         if self._landline_type_id_cache is None:
-            row = self._conn.execute(
-                "SELECT id FROM hardware_types WHERE code = ?",
-                ("TP",),
-            ).fetchone()
+            row = self._conn.execute(_TYPE_ID_BY_CODE_SQL, ("TP",)).fetchone()
             self._landline_type_id_cache = int(row["id"]) if row else -1
         return self._landline_type_id_cache if self._landline_type_id_cache > 0 else None
 
@@ -644,8 +810,12 @@ class SQLiteItemsRepository:
         snapshot_before: Optional[Dict[str, Any]] = None,
         snapshot_after: Optional[Dict[str, Any]] = None,
     ) -> None:
-        before_json = json.dumps(snapshot_before) if snapshot_before else None
-        after_json = json.dumps(snapshot_after) if snapshot_after else None
+        if not note and snapshot_before == snapshot_after:
+            return  # nothing moved and nothing to say: skip the encode and insert
+        if not self._audit_snapshots:
+            snapshot_before = snapshot_after = None
+        before_json = _dumps(snapshot_before) if snapshot_before else None
+        after_json = _dumps(snapshot_after) if snapshot_after else None
         self._updates.record(
             item_id=item_id,
             reason=reason,
@@ -655,32 +825,11 @@ class SQLiteItemsRepository:
             snapshot_after_json=after_json,
         )
 
-    def _get_record(self, item_id: int) -> Optional[ItemRecord]:
-        row = self._conn.execute(
-            """
-            SELECT
-                i.id,
-                i.type_serial,
-                i.name,
-                i.model,
-                i.type_id,
-                i.mac_address,
-                i.ip_address,
-                i.location_id,
-                i.user_id,
-                i.group_id,
-                i.sub_type_id,
-                i.notes,
-                i.extension,
-                i.asset_tag,
-                i.created_at_utc,
-                i.updated_at_utc,
-                i.archived
-            FROM items AS i
-            WHERE i.id = ?
-            """,
-            (item_id,),
-        ).fetchone()
+    def _get_record(
+        self, item_id: int, conn: Optional[sqlite3.Connection] = None
+    ) -> Optional[ItemRecord]:
+        conn = conn or self._conn
+        row = conn.execute(_SELECT_ITEM_SQL, (item_id,)).fetchone()
         if row is None:
             return None
-        return ItemRecord.from_row(row, self._metadata_maps())
+        return ItemRecord.from_row(row, self._metadata_maps(conn))
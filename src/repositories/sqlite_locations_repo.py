@@ -6,17 +6,26 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 import sqlite3
 
+from .db import write_transaction
+
 
 class SQLiteLocationsRepository:
     def __init__(self, db_or_conn) -> None:
         self._db = db_or_conn
+        if isinstance(self._db, sqlite3.Connection):
+            self._connection = self._db
+        elif hasattr(self._db, "conn"):
+            self._connection = self._db.conn
+        else:
+            raise RuntimeError("SQLiteLocationsRepository expects Database or Connection.")
 
     def _conn(self) -> sqlite3.Connection:
-        if isinstance(self._db, sqlite3.Connection):
-            return self._db
-        if hasattr(self._db, "conn"):
-            return self._db.conn
-        raise RuntimeError("SQLiteLocationsRepository expects Database or Connection.")
+        return self._connection
+
+    def _touch_catalog(self) -> None:
+        # Lets other repositories drop cached catalog lookups after a change.
+        if hasattr(self._db, "bump_catalog_version"):
+            self._db.bump_catalog_version()
 
     def list_locations(self, *, order_by: str = "name") -> List[Dict[str, str]]:
         cur = self._conn().execute(
@@ -47,33 +56,39 @@ class SQLiteLocationsRepository:
         return {"id": new_id, "name": name, "parent_id": None}
 
     def create(self, *, name: str, parent_id: Optional[int] = None) -> int:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "INSERT INTO locations(name, parent_id) VALUES (?, ?)",
                 (name, parent_id),
             )
-            return cur.lastrowid
+        self._touch_catalog()
+        return cur.lastrowid
 
     def rename(self, location_id: int, name: str) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "UPDATE locations SET name = ? WHERE id = ?", (name, location_id)
             )
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
 
     def reparent(self, location_id: int, parent_id: Optional[int]) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "UPDATE locations SET parent_id = ? WHERE id = ?",
                 (parent_id, location_id),
             )
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
 
     def delete(self, location_id: int) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute("DELETE FROM locations WHERE id = ?", (location_id,))
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
@@ -3,66 +3,118 @@
 """SQLite repository for hardware sub-types."""
 from __future__ import annotations
 
-from typing import Dict, Optional
+import json
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .db import Database
 
 
+_LIST_SQL: Dict[str, str] = {
+    "name": "SELECT id, name FROM sub_types ORDER BY name",
+    "id": "SELECT id, name FROM sub_types ORDER BY id",
+}
+
+
 class SQLiteSubTypesRepository:
+    _ALLOWED_ORDER = frozenset(_LIST_SQL)
+
     def __init__(self, database: Database) -> None:
         if not isinstance(database, Database):
             raise RuntimeError("SQLiteSubTypesRepository expects a Database instance.")
         self._db = database
         self._conn = database.conn
+        # Lookups are memoized per instance and dropped whenever the shared
+        # catalog version moves (any catalog write, from any repository).
+        self._by_name = lru_cache(maxsize=256)(self._fetch_by_name)
+        self._by_id = lru_cache(maxsize=256)(self._fetch_by_id)
+        self._cache_version = database.catalog_version
 
     def list_sub_types(self, order_by: str = "name") -> list[Dict[str, str]]:
-        cur = self._conn.execute(f"SELECT id, name FROM sub_types ORDER BY {order_by}")
-        return [dict(row) for row in cur.fetchall()]
+        return [{"id": r[0], "name": r[1]} for r in self.list_sub_types_raw(order_by)]
+
+    def list_sub_types_raw(self, order_by: str = "name") -> List[Tuple[int, str]]:
+        """Return ``(id, name)`` tuples without building Row/dict objects."""
+        if order_by not in self._ALLOWED_ORDER:
+            raise ValueError(f"Unsupported order_by for sub_types: {order_by}")
+        cur = self._conn.cursor()
+        cur.row_factory = None
+        return cur.execute(_LIST_SQL[order_by]).fetchall()
 
     def find_by_name(self, name: str) -> Optional[Dict[str, str]]:
-        cur = self._conn.execute(
-            "SELECT id, name FROM sub_types WHERE lower(name) = lower(?)",
-            (name.strip(),),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        self._sync_cache()
+        row = self._by_name(name.strip())
+        return {"id": row[0], "name": row[1]} if row else None
 
     def get(self, sub_type_id: int) -> Optional[Dict[str, str]]:
-        cur = self._conn.execute(
+        self._sync_cache()
+        row = self._by_id(int(sub_type_id))
+        return {"id": row[0], "name": row[1]} if row else None
+
+    def _sync_cache(self) -> None:
+        version = self._db.catalog_version
+        if version != self._cache_version:
+            self._by_name.cache_clear()
+            self._by_id.cache_clear()
+            self._cache_version = version
+
+    def _fetch_by_name(self, name: str) -> Optional[Tuple[int, str]]:
+        row = self._conn.execute(
+            "SELECT id, name FROM sub_types WHERE lower(name) = lower(?)",
+            (name,),
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _fetch_by_id(self, sub_type_id: int) -> Optional[Tuple[int, str]]:
+        row = self._conn.execute(
             "SELECT id, name FROM sub_types WHERE id = ?",
             (sub_type_id,),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
+        ).fetchone()
+        return (row[0], row[1]) if row else None
 
     def create(self, name: str) -> Dict[str, str]:
-        normalized = name.strip()
-        with self._conn:
-            cur = self._conn.execute(
+        return self.create_many([name])[0]
+
+    def create_many(self, names: Iterable[str]) -> List[Dict[str, str]]:
+        """Insert several sub-types in one transaction, preserving input order."""
+        normalized = [name.strip() for name in names]
+        if not normalized:
+            return []
+        with self._db.write_conn():
+            self._conn.executemany(
                 "INSERT INTO sub_types(name) VALUES (?)",
-                (normalized,),
+                [(name,) for name in normalized],
             )
-        return {"id": int(cur.lastrowid), "name": normalized}
+            rows = self._conn.execute(
+                "SELECT id, name FROM sub_types WHERE name IN (SELECT value FROM json_each(?))",
+                (json.dumps(normalized),),
+            ).fetchall()
+        self._db.bump_catalog_version()
+        ids = {row["name"]: int(row["id"]) for row in rows}
+        return [{"id": ids[name], "name": name} for name in normalized]
 
     def update(self, sub_type_id: int, *, name: str) -> Dict[str, str]:
         normalized = name.strip()
-        with self._conn:
-            self._conn.execute(
+        with self._db.write_conn():
+            cur = self._conn.execute(
                 "UPDATE sub_types SET name = ? WHERE id = ?",
                 (normalized, sub_type_id),
             )
-        record = self.get(sub_type_id)
-        if record is None:
+        if cur.rowcount == 0:
             raise ValueError(f"Sub-type {sub_type_id} not found")
-        return record
+        self._db.bump_catalog_version()
+        return {"id": int(sub_type_id), "name": normalized}
 
     def delete(self, sub_type_id: int) -> bool:
-        with self._conn:
+        with self._db.write_conn():
             cur = self._conn.execute(
                 "DELETE FROM sub_types WHERE id = ?",
                 (sub_type_id,),
             )
-        return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._db.bump_catalog_version()
+        return changed
 
     def ensure(self, name: str) -> Dict[str, str]:
         existing = self.find_by_name(name)
@@ -6,19 +6,28 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 import sqlite3
 
+from .db import write_transaction
+
 
 class SQLiteTypesRepository:
     """CRUD operations for the hardware_types table."""
 
     def __init__(self, db_or_conn) -> None:
         self._db = db_or_conn
+        if isinstance(self._db, sqlite3.Connection):
+            self._connection = self._db
+        elif hasattr(self._db, "conn"):
+            self._connection = self._db.conn
+        else:
+            raise RuntimeError("SQLiteTypesRepository expects Database or Connection.")
 
     def _conn(self) -> sqlite3.Connection:
-        if isinstance(self._db, sqlite3.Connection):
-            return self._db
-        if hasattr(self._db, "conn"):
-            return self._db.conn
-        raise RuntimeError("SQLiteTypesRepository expects Database or Connection.")
+        return self._connection
+
+    def _touch_catalog(self) -> None:
+        # Lets other repositories drop cached type codes after a change.
+        if hasattr(self._db, "bump_catalog_version"):
+            self._db.bump_catalog_version()
 
     # ---- queries -----------------------------------------------------
     def list_types(self, *, order_by: str = "name") -> List[Dict[str, str]]:
@@ -55,12 +64,12 @@ class SQLiteTypesRepository:
 
     # ---- mutations ---------------------------------------------------
     def create(self, *, name: str, code: str) -> int:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "INSERT INTO hardware_types(name, code) VALUES (?, ?)", (name, code)
             )
-            return cur.lastrowid
+        self._touch_catalog()
+        return cur.lastrowid
 
     def update(self, type_id: int, *, name: Optional[str] = None, code: Optional[str] = None) -> bool:
         if name is None and code is None:
@@ -74,15 +83,19 @@ class SQLiteTypesRepository:
             sets.append("code = ?")
             params.append(code)
         params.append(type_id)
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 f"UPDATE hardware_types SET {', '.join(sets)} WHERE id = ?", params
             )
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
 
     def delete(self, type_id: int) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute("DELETE FROM hardware_types WHERE id = ?", (type_id,))
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
@@ -3,23 +3,41 @@
 """SQLite repository for audit history entries."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
 from datetime import datetime, timezone
 import sqlite3
 
+from .db import write_transaction
+
+
+_INSERT_SQL = """
+    INSERT INTO item_updates(
+        item_id,
+        reason,
+        note,
+        changed_fields,
+        snapshot_before_json,
+        snapshot_after_json,
+        created_at_utc
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class SQLiteUpdatesRepository:
     """Handles item_updates CRUD."""
 
     def __init__(self, db_or_conn) -> None:
         self._db = db_or_conn
+        if isinstance(self._db, sqlite3.Connection):
+            self._connection = self._db
+        elif hasattr(self._db, "conn"):
+            self._connection = self._db.conn
+        else:
+            raise RuntimeError("SQLiteUpdatesRepository expects Database or Connection.")
 
     def _conn(self) -> sqlite3.Connection:
-        if isinstance(self._db, sqlite3.Connection):
-            return self._db
-        if hasattr(self._db, "conn"):
-            return self._db.conn
-        raise RuntimeError("SQLiteUpdatesRepository expects Database or Connection.")
+        return self._connection
 
     def record(
         self,
@@ -31,35 +49,63 @@ class SQLiteUpdatesRepository:
         snapshot_before_json: Optional[str] = None,
         snapshot_after_json: Optional[str] = None,
     ) -> int:
-        conn = self._conn()
-        with conn:
-            cur = conn.execute(
-                """
-                INSERT INTO item_updates(
-                    item_id,
-                    reason,
-                    note,
-                    changed_fields,
-                    snapshot_before_json,
-                    snapshot_after_json,
-                    created_at_utc
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    item_id,
-                    reason,
-                    note,
-                    ",".join(changed_fields) if changed_fields else None,
-                    snapshot_before_json,
-                    snapshot_after_json,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
+        params = self._row_params(
+            item_id,
+            reason,
+            note,
+            changed_fields,
+            snapshot_before_json,
+            snapshot_after_json,
+        )
+        # Inside the caller's write_conn() this joins its transaction, so the
+        # mutation and its audit row commit together.
+        with write_transaction(self._db) as conn:
+            return conn.execute(_INSERT_SQL, params).lastrowid
+
+    def record_many(self, entries: Iterable[Mapping[str, Any]]) -> int:
+        """Insert several audit rows with one executemany; returns the count."""
+        rows = [
+            self._row_params(
+                entry["item_id"],
+                entry["reason"],
+                entry.get("note"),
+                entry.get("changed_fields"),
+                entry.get("snapshot_before_json"),
+                entry.get("snapshot_after_json"),
             )
-            return cur.lastrowid
+            for entry in entries
+        ]
+        if not rows:
+            return 0
+        with write_transaction(self._db) as conn:
+            conn.executemany(_INSERT_SQL, rows)
+        return len(rows)
+
+    @staticmethod
+    def _row_params(
+        item_id: int,
+        reason: str,
+        note: Optional[str],
+        changed_fields: Optional[Iterable[str]],
+        snapshot_before_json: Optional[str],
+        snapshot_after_json: Optional[str],
+    ) -> tuple:
+        return (
+            item_id,
+            reason,
+            note,
+            ",".join(changed_fields) if changed_fields else None,
+            snapshot_before_json,
+            snapshot_after_json,
+            datetime.now(timezone.utc).isoformat(),
+        )
 
     def list_for_item(self, item_id: int, *, limit: int = 50) -> List[Dict[str, str]]:
-        cur = self._conn().execute(
+        return [dict(row) for row in self.iter_for_item(item_id, limit=limit)]
+
+    def iter_for_item(self, item_id: int, *, limit: int = 50) -> Iterator[sqlite3.Row]:
+        """Stream history rows for callers that do not need dict copies."""
+        return self._conn().execute(
             """
             SELECT id, item_id, reason, note, changed_fields,
                    snapshot_before_json, snapshot_after_json, created_at_utc
@@ -70,4 +116,3 @@ class SQLiteUpdatesRepository:
             """,
             (item_id, limit),
         )
-        return [dict(row) for row in cur.fetchall()]
@@ -6,17 +6,26 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 import sqlite3
 
+from .db import write_transaction
+
 
 class SQLiteUsersRepository:
     def __init__(self, db_or_conn) -> None:
         self._db = db_or_conn
+        if isinstance(self._db, sqlite3.Connection):
+            self._connection = self._db
+        elif hasattr(self._db, "conn"):
+            self._connection = self._db.conn
+        else:
+            raise RuntimeError("SQLiteUsersRepository expects Database or Connection.")
 
     def _conn(self) -> sqlite3.Connection:
-        if isinstance(self._db, sqlite3.Connection):
-            return self._db
-        if hasattr(self._db, "conn"):
-            return self._db.conn
-        raise RuntimeError("SQLiteUsersRepository expects Database or Connection.")
+        return self._connection
+
+    def _touch_catalog(self) -> None:
+        # Lets other repositories drop cached catalog lookups after a change.
+        if hasattr(self._db, "bump_catalog_version"):
+            self._db.bump_catalog_version()
 
     def list_users(self, *, order_by: str = "name") -> List[Dict[str, str]]:
         cur = self._conn().execute(
@@ -47,12 +56,12 @@ class SQLiteUsersRepository:
         return {"id": new_id, "name": name, "email": email}
 
     def create(self, *, name: str, email: Optional[str] = None) -> int:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 "INSERT INTO users(name, email) VALUES (?, ?)", (name, email)
             )
-            return cur.lastrowid
+        self._touch_catalog()
+        return cur.lastrowid
 
     def update(self, user_id: int, *, name: Optional[str] = None, email: Optional[str] = None) -> bool:
         if name is None and email is None:
@@ -66,15 +75,19 @@ class SQLiteUsersRepository:
             sets.append("email = ?")
             params.append(email)
         params.append(user_id)
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute(
                 f"UPDATE users SET {', '.join(sets)} WHERE id = ?", params
             )
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
 
     def delete(self, user_id: int) -> bool:
-        conn = self._conn()
-        with conn:
+        with write_transaction(self._db) as conn:
             cur = conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
-            return cur.rowcount > 0
+        changed = cur.rowcount > 0
+        if changed:
+            self._touch_catalog()
+        return changed
@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import datetime as _dt
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Iterable, List, Mapping, Union
 from zipfile import ZipFile, ZIP_DEFLATED
 
 
@@ -26,7 +26,7 @@ INVENTORY_COLUMNS = [
 ]
 
 
-def export_inventory(workbook_path: Path, *, items: List[Dict[str, str]]) -> None:
+def export_inventory(workbook_path: Path, *, items: Iterable[Union[Mapping[str, Any], Any]]) -> None:
     """Write an XLSX workbook with the current inventory."""
     workbook_path.parent.mkdir(parents=True, exist_ok=True)
     rows_inventory = _build_inventory_rows(items)
@@ -35,14 +35,16 @@ def export_inventory(workbook_path: Path, *, items: List[Dict[str, str]]) -> Non
         _write_inventory_sheet(zf, rows_inventory)
 
 
-def _build_inventory_rows(items: Iterable[Dict[str, str]]) -> List[List[str]]:
+def _build_inventory_rows(items: Iterable[Union[Mapping[str, Any], Any]]) -> List[List[str]]:
+    """Rows from item dicts or attribute objects such as ItemRecord."""
     rows = [[header for header, _ in INVENTORY_COLUMNS]]
     for item in items:
-        row = []
-        for _title, key in INVENTORY_COLUMNS:
-            value = item.get(key)
-            row.append(_format_value(value))
-        rows.append(row)
+        if isinstance(item, Mapping):
+            rows.append([_format_value(item.get(key)) for _title, key in INVENTORY_COLUMNS])
+        else:
+            rows.append(
+                [_format_value(getattr(item, key, None)) for _title, key in INVENTORY_COLUMNS]
+            )
     return rows
 
 
@@ -765,7 +765,7 @@ class MainWindow(QMainWindow):
             return
         path = Path(path_str)
         try:
-            items = self._items_repo.list_items(order_by="hi.asset_tag")
+            items = self._items_repo.list_records(order_by="asset_tag")
             export_inventory(path, items=items)
         except Exception as exc:
             QMessageBox.critical(self, "Export failed", str(exc))
@@ -7,3 +7,8 @@ from datetime import datetime, timezone
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
+
+
+def utc_timestamp() -> str:
+    """UTC timestamp matching SQLite's ``strftime('%Y-%m-%dT%H:%M:%SZ','now')``."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
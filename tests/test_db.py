@@ -3,9 +3,16 @@
 """Database smoke tests covering migrations and triggers."""
 from __future__ import annotations
 
+import sqlite3
+import threading
 from pathlib import Path
 
+import pytest
+
+from src.repositories import db as db_module
 from src.repositories.db import Database
+from src.repositories.sqlite_groups_repo import SQLiteGroupsRepository
+from src.repositories.sqlite_ip_addresses_repo import SQLiteIPAddressesRepository
 from src.repositories.sqlite_items_repo import SQLiteItemsRepository
 from src.utils.paths import MIGRATIONS_DIR
 
@@ -55,3 +62,207 @@ def test_asset_tag_trigger_generates_expected_value(tmp_path: Path) -> None:
         assert item["asset_tag"] == "SDMM-PC-0001"
     finally:
         db.close()
+
+
+def test_updates_stamp_updated_at_without_trigger(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    try:
+        db.run_migrations(MIGRATIONS_DIR)
+        triggers = {
+            row["name"]
+            for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        }
+        assert "trg_items_touch_updated" not in triggers
+
+        items_repo = SQLiteItemsRepository(db)
+        type_id = db.conn.execute(
+            "SELECT id FROM hardware_types WHERE code = ?", ("PC",)
+        ).fetchone()["id"]
+        item = items_repo.create(name="Stamp", type_id=type_id)
+        db.conn.execute("UPDATE items SET updated_at_utc = '2000-01-01T00:00:00Z'")
+
+        items_repo.update(item["id"], notes="touched")
+        stamped = items_repo.get(item["id"])["updated_at_utc"]
+        assert stamped > "2000-01-01T00:00:00Z"
+        assert len(stamped) == 20 and stamped.endswith("Z")
+    finally:
+        db.close()
+
+
+def test_connection_pragmas_are_tuned(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    try:
+        conn = db.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    finally:
+        db.close()
+
+    bulk = Database(tmp_path / "bulk.db", synchronous="OFF")
+    try:
+        assert bulk.conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        # The writer is shared per path, so a conflicting mode is rejected.
+        with pytest.raises(ValueError):
+            Database(tmp_path / "bulk.db", synchronous="FULL")
+        assert Database(tmp_path / "bulk.db", synchronous="off").conn is bulk.conn
+        assert bulk.conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+    finally:
+        bulk.close()
+
+
+def test_get_default_shares_one_migrated_database(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(db_module, "DB_PATH", tmp_path / "default.db")
+    shared = Database.get_default()
+    try:
+        assert Database.get_default() is shared
+        assert SQLiteIPAddressesRepository()._db is shared
+        assert SQLiteGroupsRepository()._db is shared
+        assert shared.conn.execute("SELECT COUNT(*) FROM hardware_types").fetchone()[0] > 0
+    finally:
+        shared.close()
+    assert Database._default is None
+
+
+def test_read_pool_sees_commits_and_rejects_writes(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    try:
+        db.run_migrations(MIGRATIONS_DIR)
+        with db.conn:
+            db.conn.execute("INSERT INTO groups(name) VALUES ('Ops')")
+        with db.read_conn() as reader:
+            assert reader is not db.conn
+            names = [row["name"] for row in reader.execute("SELECT name FROM groups")]
+            assert "Ops" in names
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO groups(name) VALUES ('Nope')")
+        with db.read_conn() as again:
+            assert again is reader
+    finally:
+        db.close()
+
+
+def test_read_pool_does_not_block_when_exhausted_or_closed(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    db.run_migrations(MIGRATIONS_DIR)
+    borrowed = []
+    with db.read_conn() as first:
+        # Nesting past the pool size opens extra readers instead of waiting.
+        with db.read_conn(), db.read_conn(), db.read_conn(), db.read_conn() as fifth:
+            assert fifth is not first
+            assert fifth.execute("SELECT COUNT(*) FROM groups").fetchone() is not None
+        db.close()
+        borrowed.append(first)
+    # A reader handed back after close() is closed, not returned to the pool.
+    with pytest.raises(sqlite3.ProgrammingError):
+        borrowed[0].execute("SELECT 1")
+    with pytest.raises(RuntimeError):
+        with db.read_conn():
+            pass
+
+
+def test_write_conn_serializes_writers_and_rolls_back(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    other = Database(tmp_path / "inventory.db")
+    try:
+        db.run_migrations(MIGRATIONS_DIR)
+        with pytest.raises(RuntimeError):
+            with db.write_conn() as conn:
+                conn.execute("INSERT INTO groups(name) VALUES ('Lost')")
+                raise RuntimeError("abort")
+        assert db.conn.execute("SELECT 1 FROM groups WHERE name = 'Lost'").fetchone() is None
+
+        entered = threading.Event()
+
+        def contend() -> None:
+            with other.write_conn():
+                entered.set()
+
+        with db.write_conn():
+            worker = threading.Thread(target=contend)
+            worker.start()
+            # Every handle on the file shares one writer lock.
+            assert not entered.wait(0.2)
+        worker.join(timeout=5)
+        assert entered.is_set()
+    finally:
+        other.close()
+        db.close()
+
+
+def test_catalog_writes_wait_for_an_open_write_transaction(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    try:
+        db.run_migrations(MIGRATIONS_DIR)
+        groups = SQLiteGroupsRepository(db)
+        worker = threading.Thread(target=lambda: groups.ensure("Ops"))
+        with pytest.raises(RuntimeError):
+            with db.write_conn() as conn:
+                conn.execute("INSERT INTO groups(name) VALUES ('Lost')")
+                worker.start()
+                worker.join(timeout=0.2)
+                # The repository write queues behind the lock instead of
+                # committing (or rolling back) this transaction.
+                assert worker.is_alive()
+                raise RuntimeError("abort")
+        worker.join(timeout=5)
+        names = [row["name"] for row in db.conn.execute("SELECT name FROM groups")]
+        assert "Ops" in names and "Lost" not in names
+    finally:
+        db.close()
+
+
+def test_run_migrations_applies_out_of_order_files(tmp_path: Path) -> None:
+    migrations = tmp_path / "migrations"
+    migrations.mkdir()
+    (migrations / "0001_a.sql").write_text("CREATE TABLE a (id INTEGER);", encoding="utf-8")
+    (migrations / "0003_c.sql").write_text("CREATE TABLE c (id INTEGER);", encoding="utf-8")
+    db = _db(tmp_path)
+    try:
+        assert db.run_migrations(migrations) == ["0001_a.sql", "0003_c.sql"]
+        assert db.run_migrations(migrations) == []
+
+        (migrations / "0002_b.sql").write_text("CREATE TABLE b (id INTEGER);", encoding="utf-8")
+        assert db.run_migrations(migrations) == ["0002_b.sql"]
+        assert db.run_migrations(migrations) == []
+    finally:
+        db.close()
+
+
+def test_run_migrations_restores_foreign_keys(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    try:
+        assert db.run_migrations(MIGRATIONS_DIR)
+        assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        db.close()
+
+
+def test_databases_share_one_connection_per_path(tmp_path: Path) -> None:
+    first = _db(tmp_path)
+    second = _db(tmp_path)
+    assert first.conn is second.conn
+
+    first.close()
+    assert second.conn.execute("SELECT 1").fetchone()[0] == 1
+
+    second.shutdown()
+    reopened = _db(tmp_path)
+    try:
+        assert reopened.conn is not first.conn
+        assert reopened.conn.execute("SELECT 1").fetchone()[0] == 1
+    finally:
+        reopened.shutdown()
+
+
+def test_shutdown_optimizes_and_checkpoints(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    db.run_migrations(MIGRATIONS_DIR)
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+
+    db.shutdown()
+
+    assert "PRAGMA optimize" in statements
+    assert "PRAGMA wal_checkpoint(PASSIVE)" in statements
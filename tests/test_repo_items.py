@@ -3,6 +3,8 @@
 """Repository integration tests for items and related helpers."""
 from __future__ import annotations
 
+import json
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -53,6 +55,38 @@ def test_create_item_generates_asset_tag_and_audit(tmp_path: Path) -> None:
     db.close()
 
 
+def test_create_many_inserts_batch_atomically(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    pc = _type_id(db, "PC")
+
+    created = items.create_many(
+        [
+            {"name": "Bulk A", "type_id": pc, "mac_address": "aa-bb-cc-00-00-01"},
+            {"name": "Bulk B", "type_id": pc},
+            {"name": "Bulk C", "type_id": pc, "mac_address": "aa:bb:cc:00:00:03", "note": "seed"},
+        ]
+    )
+    assert [item["mac_address"] for item in created] == ["AABBCC000001", None, "AABBCC000003"]
+    assert [item["asset_tag"] for item in created] == [
+        "SDMM-PC-0001",
+        "SDMM-PC-0002",
+        "SDMM-PC-0003",
+    ]
+    assert items.history_for_item(created[2]["id"])[0]["note"] == "seed"
+
+    with pytest.raises(ValueError):
+        items.create_many(
+            [
+                {"name": "Rolled back", "type_id": pc},
+                {"name": "Bad IP", "type_id": pc, "ip_address": "10.255.255.254"},
+            ]
+        )
+    assert len(items.list_records()) == 3
+
+    db.close()
+
+
 def test_create_rejects_duplicate_ip(tmp_path: Path) -> None:
     db = _db(tmp_path)
     items = SQLiteItemsRepository(db)
@@ -94,6 +128,12 @@ def test_update_item_tracks_changed_fields(tmp_path: Path) -> None:
         for entry in history
     )
 
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    assert not items.update(item["id"], name="Switch", notes="Mounted in rack")
+    db.conn.set_trace_callback(None)
+    assert not any(sql.lstrip().startswith("UPDATE") for sql in statements)
+
     db.close()
 
 
@@ -114,7 +154,14 @@ def test_assign_and_move_helpers_record_history(tmp_path: Path) -> None:
 
     assert items.assign(item["id"], user_id=user_id, group_id=None, note="checked out")
     assert items.assign(item["id"], group_id=group_id)
+    reads = []
+    db.conn.set_trace_callback(
+        lambda sql: reads.append(sql) if "FROM items AS i WHERE i.id" in sql else None
+    )
     assert items.move_location(item["id"], location_id=location_id, note="moved")
+    db.conn.set_trace_callback(None)
+    assert len(reads) == 1
+    assert not items.move_location(item["id"], location_id=location_id)
 
     refreshed = items.get(item["id"])
     assert refreshed["user_id"] == user_id
@@ -143,6 +190,8 @@ def test_list_records_filters_and_search(tmp_path: Path) -> None:
     filtered = items.list_records(type_ids=[laptop_type])
     assert [record.id for record in filtered] == [laptop["id"]]
     assert filtered[0].type_serial == 1
+    both = items.list_records(type_ids=[laptop_type, network_type], order_by="id")
+    assert [record.id for record in both] == [laptop["id"], switch["id"]]
 
     search_match = items.list_records(search="beta")
     assert [record.id for record in search_match] == [switch["id"]]
@@ -171,6 +220,11 @@ def test_ip_repository_tracks_allocations(tmp_path: Path) -> None:
     available_with_include = ip_repo.list_available(include="192.168.120.40")
     assert "192.168.120.40" in available_with_include
 
+    spare = ip_repo.create("10.0.0.9")
+    assert ip_repo.update(spare["id"], ip_address=" 10.0.0.10 ") == ip_repo.get(spare["id"])
+    with pytest.raises(ValueError):
+        ip_repo.update(999999, ip_address="10.0.0.11")
+
     db.close()
 
 
@@ -224,7 +278,8 @@ def test_delete_moves_item_to_archive(tmp_path: Path) -> None:
     )
     asset_tag = item["asset_tag"]
 
-    assert items.delete(item["id"], note="retired from service")
+    with pytest.warns(DeprecationWarning):
+        assert items.delete(item["id"], note="retired from service")
     assert items.get(item["id"]) is None
 
     archive_entry = db.conn.execute(
@@ -242,3 +297,364 @@ def test_delete_moves_item_to_archive(tmp_path: Path) -> None:
     assert remaining["total"] == 0
 
     db.close()
+
+
+def test_delete_many_archives_in_one_pass(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    pc = _type_id(db, "PC")
+    created = [items.create(name=f"Retire {n}", type_id=pc) for n in range(3)]
+    keep = items.create(name="Keep", type_id=pc)
+
+    ids = [item["id"] for item in created]
+    assert items.delete_many(ids + [9999]) == 3
+    assert items.delete_many(ids) == 0
+
+    archived = {
+        row["asset_tag"]
+        for row in db.conn.execute("SELECT asset_tag FROM archive WHERE archived = 1")
+    }
+    assert archived == {item["asset_tag"] for item in created}
+    assert [record.id for record in items.list_records()] == [keep["id"]]
+
+    db.close()
+
+
+def test_ip_available_is_numerically_ordered(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    ip_repo = SQLiteIPAddressesRepository(db)
+    items = SQLiteItemsRepository(db)
+
+    items.create(name="Printer", type_id=_type_id(db, "PC"), ip_address="192.168.120.9")
+    available = ip_repo.list_available(include="10.0.0.1")
+
+    assert "192.168.120.9" not in available
+    assert available[:2] == ["None", "10.0.0.1"]
+    assert available.index("192.168.120.10") > available.index("192.168.120.8")
+
+    # An include that is not in the table is placed by the SQL rules, which
+    # read every octet as decimal and do not reject values above 255.
+    ip_repo.create("10.0.0.9")
+    ip_repo.create("10.0.0.11")
+    available = ip_repo.list_available(include="10.0.0.010")
+    assert available.index("10.0.0.9") < available.index("10.0.0.010") < available.index(
+        "10.0.0.11"
+    )
+    available = ip_repo.list_available(include="10.0.0.256")
+    assert available.index("10.0.0.256") > available.index("10.0.0.11")
+
+    db.close()
+
+
+def test_catalog_listings_reject_unknown_order(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    groups = SQLiteGroupsRepository(db)
+    ip_repo = SQLiteIPAddressesRepository(db)
+
+    groups.create(name="Ops")
+    assert [g["name"] for g in groups.list_groups(order_by="name")] == ["Ops"]
+    assert groups.list_groups_raw() == [(groups.find_by_name("ops")["id"], "Ops")]
+    assert ip_repo.list_addresses_raw()[0] == tuple(ip_repo.list_addresses()[0].values())
+    assert json.loads(groups.list_groups_json()) == groups.list_groups()
+    assert json.loads(ip_repo.list_addresses_json(order_by="id")) == ip_repo.list_addresses(order_by="id")
+    assert ip_repo.list_addresses(order_by="id")
+    with pytest.raises(ValueError):
+        groups.list_groups(order_by="name; DROP TABLE groups")
+    with pytest.raises(ValueError):
+        ip_repo.list_addresses(order_by="ip_address DESC")
+
+    sub_types = SQLiteSubTypesRepository(db)
+    mount = sub_types.create("Wall Mount")
+    assert mount in sub_types.list_sub_types()
+    with pytest.raises(ValueError):
+        sub_types.list_sub_types(order_by="name DESC")
+
+    db.close()
+
+
+def test_list_available_probe_uses_covering_index(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    plan = " ".join(
+        row[3]
+        for row in db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT ip.ip_address FROM ip_addresses AS ip
+            WHERE NOT EXISTS (
+                SELECT 1 FROM items AS i
+                WHERE i.ip_address = ip.ip_address AND i.archived = 0
+            )
+            """
+        )
+    )
+    assert "COVERING INDEX ix_items_ip_archived" in plan
+
+    db.close()
+
+
+def test_ensure_returns_existing_rows(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    groups = SQLiteGroupsRepository(db)
+    ip_repo = SQLiteIPAddressesRepository(db)
+
+    created = groups.ensure("Finance")
+    version = db.catalog_version
+    assert groups.ensure("FINANCE") == created
+    assert len(groups.list_groups()) == 1
+    assert not groups.rename(created["id"] + 100, "Nobody")
+    assert not SQLiteSubTypesRepository(db).delete(9999)
+    assert db.catalog_version == version
+
+    seeded = ip_repo.find("192.168.120.7")
+    assert ip_repo.ensure(" 192.168.120.7 ") == seeded
+    fresh = ip_repo.ensure("10.1.1.1")
+    assert ip_repo.get(fresh["id"]) == fresh
+
+    db.close()
+
+
+def test_asset_tags_follow_type_code_changes(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    types_repo = SQLiteTypesRepository(db)
+    printer_type = _type_id(db, "PX")
+
+    first = items.create(name="Printer A", type_id=printer_type)
+    assert first["asset_tag"] == "SDMM-PX-0001"
+
+    types_repo.update(printer_type, code="PR")
+    second = items.create(name="Printer B", type_id=printer_type)
+    assert second["asset_tag"] == "SDMM-PR-0002"
+
+    with db.conn:
+        db.conn.execute("UPDATE hardware_types SET code = 'PQ' WHERE id = ?", (printer_type,))
+    items.invalidate_type_codes()
+    third = items.create(name="Printer C", type_id=printer_type)
+    assert third["asset_tag"] == "SDMM-PQ-0003"
+    assert third["type_code"] == "PQ"
+
+    db.close()
+
+
+def test_archive_keeps_the_item_asset_tag(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    items.create(name="Laptop", type_id=_type_id(db, "PC"))
+    printer = items.create(name="Printer", type_id=_type_id(db, "PX"))
+    assert printer["asset_tag"] == "SDMM-PX-0001"
+
+    items.delete(printer["id"])
+    tags = [row["asset_tag"] for row in db.conn.execute("SELECT asset_tag FROM archive")]
+    assert tags == ["SDMM-PX-0001"]
+
+    db.close()
+
+
+def test_item_metadata_tracks_catalog_changes(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    locations = SQLiteLocationsRepository(db)
+    sub_types = SQLiteSubTypesRepository(db)
+
+    hq = locations.create(name="HQ")
+    mount = sub_types.create("Wall Mount")
+    item = items.create(
+        name="Cam", type_id=_type_id(db, "PC"), location_id=hq, sub_type_id=mount["id"]
+    )
+    assert item["location_name"] == "HQ"
+
+    locations.rename(hq, "Head Office")
+    sub_types.update(mount["id"], name="Ceiling Mount")
+    refreshed = items.get(item["id"])
+    assert refreshed["location_name"] == "Head Office"
+    assert refreshed["sub_type_name"] == "Ceiling Mount"
+
+    db.close()
+
+
+def test_update_audit_snapshot_matches_stored_row(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+
+    item = items.create(name="Convertible", type_id=_type_id(db, "PC"))
+    items.update(item["id"], type_id=_type_id(db, "NX"), note="retag")
+
+    stored = items.get(item["id"])
+    entry = items.history_for_item(item["id"])[0]
+    after = json.loads(entry["snapshot_after_json"])
+    assert after["asset_tag"] == stored["asset_tag"] == "SDMM-NX-0001"
+    assert after["type_name"] == stored["type_name"]
+    # Snapshots are diffs: untouched columns are left out.
+    assert "name" not in after
+    assert json.loads(entry["snapshot_before_json"])["asset_tag"] == "SDMM-PC-0001"
+
+    db.close()
+
+
+def test_search_uses_fts_index_and_tracks_changes(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+
+    switch = items.create(
+        name="Core Switch", type_id=_type_id(db, "NX"), mac_address="aa:bb:cc:00:11:22"
+    )
+    laptop = items.create(name="Field Laptop", type_id=_type_id(db, "PC"))
+
+    def found(query: str) -> list[int]:
+        return [record.id for record in items.list_records(search=query)]
+
+    assert found("CORE sw") == [switch["id"]]
+    assert found("cc0011") == [switch["id"]]
+    assert found("NX-0001") == [switch["id"]]
+    assert found('"quoted') == []
+    assert found("ap") == [laptop["id"]]
+
+    items.update(laptop["id"], type_id=_type_id(db, "NX"), name="Bench Laptop")
+    assert found("NX-0002") == [laptop["id"]]
+    assert found("Field") == []
+
+    items.delete(switch["id"])
+    assert found("Core") == []
+
+    plan = " ".join(
+        row["detail"]
+        for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT rowid FROM items_fts WHERE items_fts MATCH ?",
+            ('"Core"',),
+        )
+    )
+    assert "VIRTUAL TABLE INDEX" in plan
+
+    db.close()
+
+
+def test_list_records_sorts_names_case_insensitively(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    pc_type = _type_id(db, "PC")
+
+    for name in ("bravo", "Alpha", "charlie"):
+        items.create(name=name, type_id=pc_type)
+
+    ordered = items.list_records(order_by="i.name ASC")
+    assert [record.name for record in ordered] == ["Alpha", "bravo", "charlie"]
+    with pytest.raises(ValueError):
+        items.list_records(order_by="name; DROP TABLE items")
+
+    plan = " ".join(
+        row["detail"]
+        for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT i.id FROM items AS i "
+            "WHERE i.archived = 0 ORDER BY lower(i.name) LIMIT 5"
+        )
+    )
+    assert "ix_items_active_name_lower" in plan
+    assert "TEMP B-TREE" not in plan
+
+    default_plan = " ".join(
+        row["detail"]
+        for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT i.id FROM items AS i "
+            "WHERE i.archived = 0 ORDER BY i.updated_at_utc DESC LIMIT 5"
+        )
+    )
+    assert "ix_items_active_updated" in default_plan
+    assert "TEMP B-TREE" not in default_plan
+
+    db.close()
+
+
+def test_sub_types_create_many_is_one_batch(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    sub_types = SQLiteSubTypesRepository(db)
+
+    version = db.catalog_version
+    created = sub_types.create_many([" Wall Mount", "Desk Mount ", "Rack Mount"])
+    assert [row["name"] for row in created] == ["Wall Mount", "Desk Mount", "Rack Mount"]
+    assert [sub_types.get(row["id"]) for row in created] == created
+    assert db.catalog_version == version + 1
+    assert sub_types.create_many([]) == []
+
+    with pytest.raises(sqlite3.IntegrityError):
+        sub_types.create_many(["Shelf", "wall mount"])
+    assert sub_types.find_by_name("Shelf") is None
+
+    db.close()
+
+
+def test_sub_type_lookups_are_cached_until_catalog_changes(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    sub_types = SQLiteSubTypesRepository(db)
+    mount = sub_types.ensure("Wall Mount")
+
+    statements: list[str] = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        for _ in range(3):
+            assert sub_types.ensure("Wall Mount") == mount
+            assert sub_types.get(mount["id"]) == mount
+        assert len(statements) == 2
+
+        SQLiteSubTypesRepository(db).update(mount["id"], name="Ceiling Mount")
+        assert sub_types.get(mount["id"])["name"] == "Ceiling Mount"
+        assert sub_types.find_by_name("Wall Mount") is None
+    finally:
+        db.conn.set_trace_callback(None)
+
+    db.close()
+
+
+def test_audit_row_commits_with_the_mutation(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    item = items.create(name="Audited", type_id=_type_id(db, "PC"))
+
+    commits = []
+    db.conn.set_trace_callback(
+        lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None
+    )
+    items.update(item["id"], name="Audited 2", note="rename")
+    db.conn.set_trace_callback(None)
+    assert len(commits) == 1
+
+    def _fail(**_kwargs):
+        raise RuntimeError("audit failed")
+
+    items._updates.record = _fail
+    with pytest.raises(RuntimeError):
+        items.update(item["id"], name="Lost")
+    assert items.get(item["id"])["name"] == "Audited 2"
+
+    db.close()
+
+
+def test_updates_record_many_inserts_batch(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db)
+    item = items.create(name="Batch", type_id=_type_id(db, "PC"))
+
+    count = items._updates.record_many(
+        {"item_id": item["id"], "reason": "audit", "note": f"note {n}"}
+        for n in range(3)
+    )
+
+    assert count == 3
+    notes = [row["note"] for row in items.history_for_item(item["id"])]
+    assert {"note 0", "note 1", "note 2"} <= set(notes)
+
+    db.close()
+
+
+def test_audit_snapshots_can_be_disabled(tmp_path: Path) -> None:
+    db = _db(tmp_path)
+    items = SQLiteItemsRepository(db, audit_snapshots=False)
+    item = items.create(name="Lean", type_id=_type_id(db, "PC"))
+    items.update(item["id"], notes="trimmed")
+
+    history = items.history_for_item(item["id"])
+    assert {entry["reason"] for entry in history} == {"create", "update"}
+    assert all(entry["snapshot_before_json"] is None for entry in history)
+    assert all(entry["snapshot_after_json"] is None for entry in history)
+    assert any("notes" in (entry["changed_fields"] or "") for entry in history)
+
+    db.close()
@@ -47,6 +47,11 @@ def test_export_inventory_generates_xlsx(tmp_path: Path) -> None:
             assert "Laptop" in sheet1
             assert "IP Address" in sheet1
             assert "Sub Type" in sheet1
+
+        records_path = tmp_path / "inventory-records.xlsx"
+        export_inventory(records_path, items=items_repo.list_records())
+        with ZipFile(records_path) as zf:
+            assert zf.read("xl/worksheets/sheet1.xml").decode() == sheet1
     finally:
         db.close()
 